@@ -1,6 +1,16 @@
+import os
+import signal
+import sqlite3
 import sys
+import time
+from collections import OrderedDict, deque
+from fractions import Fraction
+from itertools import combinations
+from math import lcm
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
 from pathlib import Path
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 # Import explicitly to satisfy lint rules and keep namespace clean.
 from pulp import (
@@ -59,54 +69,87 @@ def parse_machine(line: str) -> Tuple[List[int], List[Set[int]], List[int]]:
     return target_state, buttons, joltages
 
 
-def solve_machine_lights_ilp(target_state: List[int], buttons: List[Set[int]]) -> int:
+def add_lights_model(prob: LpProblem, target_state: List[int], buttons: List[Set[int]], prefix: str = ""):
     """
-    Solve the light configuration problem using Integer Linear Programming.
+    Add one machine's light constraints to prob.
 
     For Part 1, we need to handle mod 2 arithmetic:
     - Each button can be pressed 0 or 1 times
     - Sum of presses affecting each light (mod 2) must equal target
 
     Returns:
-        Minimum number of button presses needed, or -1 if impossible
+        The machine's button variables, or None if it is trivially impossible
     """
-    num_lights = len(target_state)
-    num_buttons = len(buttons)
-
-    # Create the problem
-    prob = LpProblem("LightConfig", LpMinimize)
+    # Buttons affecting each light; a lit target nobody can toggle is impossible. Checked
+    # before touching prob so a batched model never keeps a rejected machine's constraints
+    affecting = [
+        [b_idx for b_idx, button in enumerate(buttons) if light_idx in button] for light_idx in range(len(target_state))
+    ]
+    if any(not idxs and target_state[light_idx] == 1 for light_idx, idxs in enumerate(affecting)):
+        return None  # Impossible
 
     # Decision variables: whether to press each button (0 or 1)
-    button_vars = [LpVariable(f"b{i}", cat="Binary") for i in range(num_buttons)]
-
-    # Objective: minimize total button presses
-    prob += lpSum(button_vars), "TotalPresses"
+    button_vars = [LpVariable(f"{prefix}b{i}", cat="Binary") for i in range(len(buttons))]
 
     # Constraints: for each light, sum of affecting buttons (mod 2) = target
     # To handle mod 2, we introduce auxiliary variables
     # If sum is odd, it equals 1 (mod 2), if even, it equals 0 (mod 2)
 
-    for light_idx in range(num_lights):
-        # Find which buttons affect this light
-        affecting_buttons = [button_vars[b_idx] for b_idx, button in enumerate(buttons) if light_idx in button]
-
-        if not affecting_buttons:
-            # No buttons affect this light
-            if target_state[light_idx] == 1:
-                return -1  # Impossible
+    for light_idx, idxs in enumerate(affecting):
+        if not idxs:
+            # No buttons affect this light (and it must stay off)
             continue
 
-        # Sum of affecting buttons
-        button_sum = lpSum(affecting_buttons)
-
         # We need: button_sum ≡ target_state[light_idx] (mod 2)
         # This means: button_sum = target_state[light_idx] + 2k for some integer k ≥ 0
+        k = LpVariable(f"{prefix}k{light_idx}", lowBound=0, cat="Integer")
+        affecting_buttons = [button_vars[b_idx] for b_idx in idxs]
+        prob += lpSum(affecting_buttons) == target_state[light_idx] + 2 * k, f"{prefix}Light{light_idx}_mod2"
+
+    return button_vars
+
+
+def add_joltage_model(prob: LpProblem, joltages: List[int], buttons: List[Set[int]], prefix: str = ""):
+    """
+    Add one machine's joltage constraints to prob.
+
+    For Part 2, this is straightforward:
+    - Each button can be pressed any number of times (≥ 0)
+    - Sum of presses affecting each counter must equal target
+
+    Returns:
+        The machine's button variables, or None if it is trivially impossible
+    """
+    # Buttons affecting each counter; a nonzero target nobody can raise is impossible.
+    # Checked before touching prob so a batched model never keeps a rejected machine's constraints
+    affecting = [
+        [b_idx for b_idx, button in enumerate(buttons) if counter_idx in button] for counter_idx in range(len(joltages))
+    ]
+    if any(not idxs and joltages[counter_idx] != 0 for counter_idx, idxs in enumerate(affecting)):
+        return None  # Impossible
+
+    # Decision variables: number of times to press each button (≥ 0)
+    button_vars = [LpVariable(f"{prefix}b{i}", lowBound=0, cat="Integer") for i in range(len(buttons))]
+
+    # Constraints: for each counter, sum of affecting buttons = target
+    for counter_idx, idxs in enumerate(affecting):
+        if not idxs:
+            # No buttons affect this counter (and it must stay at zero)
+            continue
+
+        affecting_buttons = [button_vars[b_idx] for b_idx in idxs]
+        prob += lpSum(affecting_buttons) == joltages[counter_idx], f"{prefix}Counter{counter_idx}"
+
+    return button_vars
+
 
-        # Introduce auxiliary variable for the quotient
-        k = LpVariable(f"k{light_idx}", lowBound=0, cat="Integer")
+def solve_single_ilp(prob: LpProblem, button_vars) -> int:
+    """Minimise total presses for a one-machine model; -1 if impossible."""
+    if button_vars is None:
+        return -1
 
-        # Constraint: button_sum = target_state[light_idx] + 2*k
-        prob += button_sum == target_state[light_idx] + 2 * k, f"Light{light_idx}_mod2"
+    # Objective: minimize total button presses
+    prob += lpSum(button_vars), "TotalPresses"
 
     # Solve
     prob.solve(PULP_CBC_CMD(msg=0))
@@ -118,54 +161,437 @@ def solve_machine_lights_ilp(target_state: List[int], buttons: List[Set[int]]) -
     return int(value(prob.objective))
 
 
+def solve_machine_lights_ilp(target_state: List[int], buttons: List[Set[int]]) -> int:
+    """
+    Solve the light configuration problem using Integer Linear Programming.
+
+    Returns:
+        Minimum number of button presses needed, or -1 if impossible
+    """
+    prob = LpProblem("LightConfig", LpMinimize)
+    return solve_single_ilp(prob, add_lights_model(prob, target_state, buttons))
+
+
 def solve_machine_joltage_ilp(joltages: List[int], buttons: List[Set[int]]) -> int:
     """
     Solve the joltage configuration problem using Integer Linear Programming.
 
-    For Part 2, this is straightforward:
-    - Each button can be pressed any number of times (≥ 0)
-    - Sum of presses affecting each counter must equal target
+    Returns:
+        Minimum number of button presses needed, or -1 if impossible
+    """
+    prob = LpProblem("JoltageConfig", LpMinimize)
+    return solve_single_ilp(prob, add_joltage_model(prob, joltages, buttons))
+
+
+def solve_machines_batched_ilp(machines, part: int, threads: Optional[int] = None) -> List[int]:
+    """
+    Solve many machines with a single block-diagonal ILP and one CBC call.
+
+    Every machine's variables and constraints go into one model under a per-machine name
+    prefix; the machines share no constraints, so minimising the summed presses minimises
+    each machine independently. This pays CBC's process spawn and LP file I/O once.
+    If the combined model is not optimal (some machine is infeasible), machines fall back
+    to individual solves so the infeasible ones can be identified.
+
+    Args:
+        machines: Parsed machines from parse_machine.
+        part: 1 for lights, 2 for joltages.
+        threads: Optional CBC thread count.
+
+    Returns:
+        Minimum presses per machine in input order (-1 if impossible).
+    """
+    prob = LpProblem("BatchedLightConfig" if part == 1 else "BatchedJoltageConfig", LpMinimize)
+    machine_vars = []
+    for idx, (target_state, buttons, joltages) in enumerate(machines):
+        prefix = f"m{idx}_"
+        if part == 1:
+            machine_vars.append(add_lights_model(prob, target_state, buttons, prefix))
+        else:
+            machine_vars.append(add_joltage_model(prob, joltages, buttons, prefix))
+
+    solvable = [button_vars for button_vars in machine_vars if button_vars is not None]
+    if solvable:
+        prob += lpSum(var for button_vars in solvable for var in button_vars), "TotalPresses"
+        prob.solve(PULP_CBC_CMD(msg=0, threads=threads))
+        if prob.status != LpStatusOptimal:
+            return [solve_machine(part, machine, use_ilp=True) for machine in machines]
+
+    return [
+        -1 if button_vars is None else round(sum(value(var) for var in button_vars)) for button_vars in machine_vars
+    ]
+
+
+def gf2_eliminate(rows: List[int], num_cols: int) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    Reduce bit-packed rows over GF(2) to reduced row echelon form.
+
+    Each row holds the coefficient bits 0..num_cols-1 plus the right-hand side at bit num_cols.
+
+    Returns:
+        pivots: List of (pivot column, reduced row)
+        consistent: False if some row reduced to 0 = 1
+    """
+    rows = list(rows)
+    pivots = []
+    rank = 0
+
+    for col in range(num_cols):
+        bit = 1 << col
+        pivot_idx = next((i for i in range(rank, len(rows)) if rows[i] & bit), None)
+        if pivot_idx is None:
+            continue
+        rows[rank], rows[pivot_idx] = rows[pivot_idx], rows[rank]
+        pivot_row = rows[rank]
+        for i in range(len(rows)):
+            if i != rank and rows[i] & bit:
+                rows[i] ^= pivot_row
+        pivots.append(col)
+        rank += 1
+
+    consistent = all(row == 0 for row in rows[rank:])
+    return list(zip(pivots, rows[:rank])), consistent
+
+
+def min_weight_in_coset(particular: int, basis: List[int]) -> int:
+    """
+    Minimum popcount over particular XOR (any combination of basis vectors).
+
+    Small null spaces are walked in Gray-code order (one XOR per step). Larger ones are
+    searched by increasing number of free presses, stopping once that count alone reaches
+    the best total found.
+    """
+    best = particular.bit_count()
+
+    if len(basis) <= 20:
+        current = particular
+        for step in range(1, 1 << len(basis)):
+            current ^= basis[(step & -step).bit_length() - 1]
+            best = min(best, current.bit_count())
+        return best
+
+    for free_presses in range(1, len(basis) + 1):
+        if free_presses >= best:
+            break
+        for combo in combinations(basis, free_presses):
+            current = particular
+            for vec in combo:
+                current ^= vec
+            best = min(best, current.bit_count())
+    return best
+
+
+def solve_machine_lights_gf2(target_state: List[int], buttons: List[Set[int]]) -> int:
+    """
+    Solve the light configuration problem with Gaussian elimination over GF(2).
+
+    Pressing a button twice cancels out, so each button is pressed 0 or 1 times and
+    the lights are a linear system mod 2. After elimination, every solution is the
+    particular solution XOR a null-space combination; the cheapest one is the answer.
 
     Returns:
         Minimum number of button presses needed, or -1 if impossible
     """
-    num_counters = len(joltages)
     num_buttons = len(buttons)
 
-    # Create the problem
-    prob = LpProblem("JoltageConfig", LpMinimize)
+    # One bit-packed row per light: bit b set if button b toggles it, target at bit num_buttons
+    rows = []
+    for light_idx, target in enumerate(target_state):
+        mask = 0
+        for b_idx, button in enumerate(buttons):
+            if light_idx in button:
+                mask |= 1 << b_idx
+        rows.append(mask | (target << num_buttons))
+
+    pivots, consistent = gf2_eliminate(rows, num_buttons)
+    if not consistent:
+        return -1
 
-    # Decision variables: number of times to press each button (≥ 0)
-    button_vars = [LpVariable(f"b{i}", lowBound=0, cat="Integer") for i in range(num_buttons)]
+    pivot_cols = {col for col, _ in pivots}
+    free_cols = [col for col in range(num_buttons) if col not in pivot_cols]
 
-    # Objective: minimize total button presses
-    prob += lpSum(button_vars), "TotalPresses"
+    # Particular solution: all free buttons unpressed, pivots read straight off the RHS
+    particular = 0
+    for col, row in pivots:
+        if row >> num_buttons & 1:
+            particular |= 1 << col
 
-    # Constraints: for each counter, sum of affecting buttons = target
-    for counter_idx in range(num_counters):
-        # Find which buttons affect this counter
-        affecting_buttons = [button_vars[b_idx] for b_idx, button in enumerate(buttons) if counter_idx in button]
-
-        if not affecting_buttons:
-            # No buttons affect this counter
-            if joltages[counter_idx] != 0:
-                return -1  # Impossible
+    # Null space: pressing free button f forces every pivot whose row contains f
+    basis = []
+    for free in free_cols:
+        vec = 1 << free
+        for col, row in pivots:
+            if row >> free & 1:
+                vec |= 1 << col
+        basis.append(vec)
+
+    return min_weight_in_coset(particular, basis)
+
+
+def integer_eliminate(
+    joltages: List[int], buttons: List[Set[int]]
+) -> Tuple[List[Tuple[int, int, int, List[int]]], List[int], bool]:
+    """
+    Gauss-Jordan elimination of the joltage system with exact rational arithmetic.
+
+    Each pivot row is scaled back to integers, so it reads
+        scale * x[pivot] = rhs - sum(coeffs[f] * x[f] for free buttons f)
+
+    Returns:
+        pivots: List of (pivot column, scale, rhs, coeffs indexed like free_cols)
+        free_cols: Buttons left as free variables
+        consistent: False if some row reduced to 0 = nonzero
+    """
+    num_buttons = len(buttons)
+    rows = [
+        [Fraction(1 if counter_idx in button else 0) for button in buttons] + [Fraction(target)]
+        for counter_idx, target in enumerate(joltages)
+    ]
+
+    pivot_cols = []
+    rank = 0
+    for col in range(num_buttons):
+        pivot_idx = next((i for i in range(rank, len(rows)) if rows[i][col] != 0), None)
+        if pivot_idx is None:
             continue
+        rows[rank], rows[pivot_idx] = rows[pivot_idx], rows[rank]
+        pivot_value = rows[rank][col]
+        rows[rank] = [v / pivot_value for v in rows[rank]]
+        for i in range(len(rows)):
+            if i != rank and rows[i][col] != 0:
+                factor = rows[i][col]
+                rows[i] = [a - factor * b for a, b in zip(rows[i], rows[rank])]
+        pivot_cols.append(col)
+        rank += 1
 
-        # Constraint: sum = target
-        prob += lpSum(affecting_buttons) == joltages[counter_idx], f"Counter{counter_idx}"
+    consistent = all(row[-1] == 0 for row in rows[rank:])
+    free_cols = [col for col in range(num_buttons) if col not in pivot_cols]
 
-    # Solve
-    prob.solve(PULP_CBC_CMD(msg=0))
+    pivots = []
+    for col, row in zip(pivot_cols, rows):
+        scale = lcm(*(v.denominator for v in row))
+        coeffs = [int(row[f] * scale) for f in free_cols]
+        pivots.append((col, scale, int(row[-1] * scale), coeffs))
 
-    # Check if solution was found
-    if prob.status != LpStatusOptimal:
+    return pivots, free_cols, consistent
+
+
+def solve_machine_joltage_exact(joltages: List[int], buttons: List[Set[int]]) -> int:
+    """
+    Solve the joltage configuration problem exactly, in-process.
+
+    Elimination leaves a few free buttons; every pivot button is then determined by them.
+    A button can never be pressed more often than the smallest target among the counters it
+    feeds, which bounds every variable. The free buttons are searched depth-first within
+    those bounds, pruning a branch when some pivot can no longer land in its range or when
+    the best reachable total cannot beat the incumbent.
+
+    Returns:
+        Minimum number of button presses needed, or -1 if impossible
+    """
+    pivots, free_cols, consistent = integer_eliminate(joltages, buttons)
+    if not consistent:
         return -1
 
-    return int(value(prob.objective))
+    upper = [min((joltages[c] for c in button if c < len(joltages)), default=0) for button in buttons]
+
+    # Search the tightest free buttons first
+    order = sorted(range(len(free_cols)), key=lambda k: upper[free_cols[k]])
+    free_upper = [upper[free_cols[k]] for k in order]
+    pivots = [(col, scale, rhs, [coeffs[k] for k in order]) for col, scale, rhs, coeffs in pivots]
+    num_free = len(order)
+
+    # total = sum(free) + sum(pivots) = base + sum(weight[k] * free[k])
+    base = sum(Fraction(rhs, scale) for _, scale, rhs, _ in pivots)
+    weight = [1 - sum(Fraction(coeffs[k], scale) for _, scale, _, coeffs in pivots) for k in range(num_free)]
+
+    # Suffix bounds over the still-unassigned free buttons (depth d covers k >= d)
+    def suffix(values):
+        out = [0] * (num_free + 1)
+        for k in range(num_free - 1, -1, -1):
+            out[k] = out[k + 1] + values[k]
+        return out
+
+    best_weight_gain = suffix([min(weight[k], 0) * free_upper[k] for k in range(num_free)])
+    pivot_rise = [suffix([max(-c, 0) * free_upper[k] for k, c in enumerate(coeffs)]) for _, _, _, coeffs in pivots]
+    pivot_drop = [suffix([max(c, 0) * free_upper[k] for k, c in enumerate(coeffs)]) for _, _, _, coeffs in pivots]
+
+    best = None
+
+    def search(depth, residuals, objective):
+        nonlocal best
+        if best is not None and objective + best_weight_gain[depth] >= best:
+            return
+
+        # Every pivot must still be able to reach 0 <= value <= upper bound
+        for p, (col, scale, _, _) in enumerate(pivots):
+            if residuals[p] + pivot_rise[p][depth] < 0:
+                return
+            if residuals[p] - pivot_drop[p][depth] > scale * upper[col]:
+                return
+
+        if depth == num_free:
+            if all(residuals[p] % pivots[p][1] == 0 for p in range(len(pivots))):
+                best = int(objective)
+            return
+
+        for presses in range(free_upper[depth] + 1):
+            next_residuals = [r - coeffs[depth] * presses for r, (_, _, _, coeffs) in zip(residuals, pivots)]
+            search(depth + 1, next_residuals, objective + weight[depth] * presses)
 
+    search(0, [rhs for _, _, rhs, _ in pivots], base)
+    return -1 if best is None else best
 
-def solve_part1(lines: List[str]) -> int:
+
+def solve_machine(part: int, machine: Tuple[List[int], List[Set[int]], List[int]], use_ilp: bool = False) -> int:
+    """Solve one parsed machine for the given part; -1 if impossible."""
+    target_state, buttons, joltages = machine
+    if part == 1:
+        solver = solve_machine_lights_ilp if use_ilp else solve_machine_lights_gf2
+        return solver(target_state, buttons)
+    solver = solve_machine_joltage_ilp if use_ilp else solve_machine_joltage_exact
+    return solver(joltages, buttons)
+
+
+def canonical_key(part: int, machine: Tuple[List[int], List[Set[int]], List[int]], max_leaves: int = 512) -> str:
+    """
+    Describe a machine for one part in a form that survives reordering buttons and lights.
+
+    Lights start coloured by their target and are refined until stable: a light's colour
+    gains the multiset of its buttons' colours, a button's colour is the multiset of its
+    lights' colours. Lights still tied are individualised one at a time (each choice
+    refined again), and the key is the smallest relabelling over all resulting orders, so
+    it does not depend on the input labelling. The key is always an exact relabelling of
+    the machine, so two machines with the same key have the same answer.
+
+    Args:
+        part: 1 keys on the light targets, 2 on the joltages.
+        machine: Parsed machine from parse_machine.
+        max_leaves: Bound on the orders compared for highly symmetric machines; past it the
+            key is still exact but may differ between relabellings (a cache miss, never a
+            wrong answer).
+    """
+    target_state, buttons, joltages = machine
+    targets = target_state if part == 1 else joltages
+    num_lights = len(targets)
+    button_lights = [[c for c in button if 0 <= c < num_lights] for button in buttons]
+    light_buttons = [[] for _ in range(num_lights)]
+    for b_idx, lights in enumerate(button_lights):
+        for light_idx in lights:
+            light_buttons[light_idx].append(b_idx)
+
+    def refine(colours):
+        while True:
+            button_sigs = [tuple(sorted(colours[c] for c in lights)) for lights in button_lights]
+            light_sigs = [
+                (colours[c], tuple(sorted(button_sigs[b_idx] for b_idx in light_buttons[c]))) for c in range(num_lights)
+            ]
+            palette = {sig: rank for rank, sig in enumerate(sorted(set(light_sigs)))}
+            refined = [palette[sig] for sig in light_sigs]
+            if len(palette) == len(set(colours)):
+                return refined
+            colours = refined
+
+    def relabelled(colours):
+        order = sorted(range(num_lights), key=colours.__getitem__)
+        relabel = {old: new for new, old in enumerate(order)}
+        canonical_buttons = sorted(tuple(sorted(relabel[c] for c in lights)) for lights in button_lights)
+        return tuple(targets[old] for old in order), tuple(canonical_buttons)
+
+    best = None
+    leaves = 0
+    stack = [refine(list(targets))]
+    while stack and leaves < max_leaves:
+        colours = stack.pop()
+        cells = {}
+        for light_idx, colour in enumerate(colours):
+            cells.setdefault(colour, []).append(light_idx)
+        tied = [cell for _, cell in sorted(cells.items()) if len(cell) > 1]
+        if not tied:
+            leaves += 1
+            candidate = relabelled(colours)
+            if best is None or candidate < best:
+                best = candidate
+            continue
+        # Split the first tied cell: each member in turn goes ahead of the rest of its cell
+        for chosen in tied[0]:
+            stack.append(refine([2 * colour + (light_idx != chosen) for light_idx, colour in enumerate(colours)]))
+
+    return repr((part,) + best)
+
+
+class SolutionCache:
+    """
+    Memo of machine answers keyed by canonical_key.
+
+    An in-memory LRU sits in front of an optional SQLite file, so repeat machines skip the
+    solver within a run and across runs.
+    """
+
+    def __init__(self, path: Optional[Path] = None, maxsize: int = 4096):
+        self.memory = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, presses INTEGER)")
+
+    def get(self, key: str) -> Optional[int]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.db is not None:
+            row = self.db.execute("SELECT presses FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._remember(key, row[0])
+                return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, presses: int):
+        self._remember(key, presses)
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, presses))
+            self.db.commit()
+
+    def _remember(self, key: str, presses: int):
+        self.memory[key] = presses
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def solve_machine_cached(
+    part: int, machine: Tuple[List[int], List[Set[int]], List[int]], cache: SolutionCache, use_ilp: bool = False
+) -> int:
+    """solve_machine behind a SolutionCache lookup."""
+    key = canonical_key(part, machine)
+    min_presses = cache.get(key)
+    if min_presses is None:
+        min_presses = solve_machine(part, machine, use_ilp)
+        cache.put(key, min_presses)
+    return min_presses
+
+
+def report_machine(line_num: int, min_presses: int) -> int:
+    """Print one machine's result and return what it adds to the total."""
+    if min_presses == -1:
+        print(f"Machine {line_num}: No solution possible!")
+        return 0
+    print(f"Machine {line_num}: {min_presses} presses needed")
+    return min_presses
+
+
+def solve_part1(lines: List[str], use_ilp: bool = False, cache: Optional[SolutionCache] = None) -> int:
     """Solve part 1: Find minimum button presses for light configuration."""
     total_presses = 0
 
@@ -173,19 +599,17 @@ def solve_part1(lines: List[str]) -> int:
         if not line.strip():
             continue
 
-        target_state, buttons, _ = parse_machine(line)
-        min_presses = solve_machine_lights_ilp(target_state, buttons)
-
-        if min_presses == -1:
-            print(f"Machine {line_num}: No solution possible!")
+        machine = parse_machine(line)
+        if cache is None:
+            min_presses = solve_machine(1, machine, use_ilp)
         else:
-            print(f"Machine {line_num}: {min_presses} presses needed")
-            total_presses += min_presses
+            min_presses = solve_machine_cached(1, machine, cache, use_ilp)
+        total_presses += report_machine(line_num, min_presses)
 
     return total_presses
 
 
-def solve_part2(lines: List[str]) -> int:
+def solve_part2(lines: List[str], use_ilp: bool = False, cache: Optional[SolutionCache] = None) -> int:
     """Solve part 2: Find minimum button presses for joltage configuration."""
     total_presses = 0
 
@@ -193,19 +617,199 @@ def solve_part2(lines: List[str]) -> int:
         if not line.strip():
             continue
 
-        _, buttons, joltages = parse_machine(line)
-        min_presses = solve_machine_joltage_ilp(joltages, buttons)
+        machine = parse_machine(line)
+        if cache is None:
+            min_presses = solve_machine(2, machine, use_ilp)
+        else:
+            min_presses = solve_machine_cached(2, machine, cache, use_ilp)
+        total_presses += report_machine(line_num, min_presses)
+
+    return total_presses
+
+
+def _machine_worker(conn, part: int, machine: Tuple[List[int], List[Set[int]], List[int]], use_ilp: bool):
+    """
+    Process entry point: send ("ok", presses) or ("error", message) back over conn.
 
-        if min_presses == -1:
-            print(f"Machine {line_num}: No solution possible!")
+    The worker leads its own process group, so a timeout can kill it together with any
+    solver it spawned (CBC runs as a child process of PULP_CBC_CMD).
+    """
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        conn.send(("ok", solve_machine(part, machine, use_ilp)))
+    except Exception as exc:
+        conn.send(("error", repr(exc)))
+    finally:
+        conn.close()
+
+
+def _kill_process_group(process: Process):
+    """SIGKILL a worker and its process group (its CBC child included) where supported."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # The worker has not called setsid yet, so there is no group to kill
+            pass
+    process.kill()
+
+
+def solve_parallel(
+    lines: List[str],
+    part: int,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    use_ilp: bool = False,
+    cache: Optional[SolutionCache] = None,
+) -> int:
+    """
+    Solve every machine of one part in at most `workers` concurrent processes.
+
+    Each machine runs in its own process with its own deadline, counted from the moment
+    that process starts. A machine that exceeds `timeout` seconds is killed along with any
+    CBC process it started, freeing its slot for the next machine; it is reported and left
+    out of the total, as is one that raises. Results are reported in input order, so the
+    report and total match the sequential solvers. With a cache, hits are answered without
+    starting a process and solved machines are stored.
+
+    Args:
+        lines: Puzzle input lines.
+        part: 1 for lights, 2 for joltages.
+        workers: Maximum concurrent processes (None uses os.cpu_count()).
+        timeout: Seconds each machine may run (None lets it run to completion).
+        use_ilp: Use the pulp/CBC solvers instead of the native ones.
+        cache: Optional SolutionCache consulted before and filled after solving.
+    """
+    machines = [(line_num, parse_machine(line)) for line_num, line in enumerate(lines, 1) if line.strip()]
+    outcomes = {}
+    keys = {}  # line_num -> canonical key, for cache misses only
+    pending = deque()
+    for line_num, machine in machines:
+        if cache is not None:
+            key = canonical_key(part, machine)
+            cached = cache.get(key)
+            if cached is not None:
+                outcomes[line_num] = ("ok", cached)
+                continue
+            keys[line_num] = key
+        pending.append((line_num, machine))
+
+    workers = workers or os.cpu_count() or 1
+    running = {}  # result pipe -> (line_num, process, deadline)
+
+    def finish(reader, outcome):
+        line_num, process, _ = running.pop(reader)
+        if outcome is None:
+            _kill_process_group(process)
+        process.join()
+        reader.close()
+        outcomes[line_num] = outcome or ("timeout", None)
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                line_num, machine = pending.popleft()
+                reader, writer = Pipe(duplex=False)
+                process = Process(target=_machine_worker, args=(writer, part, machine, use_ilp), daemon=True)
+                process.start()
+                writer.close()
+                deadline = None if timeout is None else time.monotonic() + timeout
+                running[reader] = (line_num, process, deadline)
+
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for reader in wait(list(running), timeout=wait_for):
+                try:
+                    outcome = reader.recv()
+                except EOFError:
+                    outcome = ("error", "worker exited without a result")
+                finish(reader, outcome)
+
+            now = time.monotonic()
+            for reader, (_, _, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    finish(reader, None)
+    finally:
+        for reader in list(running):
+            finish(reader, None)
+
+    total_presses = 0
+    for line_num, _ in machines:
+        status, result = outcomes[line_num]
+        if status == "timeout":
+            print(f"Machine {line_num}: timed out after {timeout}s")
+        elif status == "error":
+            print(f"Machine {line_num}: failed ({result})")
         else:
-            print(f"Machine {line_num}: {min_presses} presses needed")
-            total_presses += min_presses
+            if line_num in keys:
+                cache.put(keys[line_num], result)
+            total_presses += report_machine(line_num, result)
 
     return total_presses
 
 
-def main(filename: str = "input_test.txt"):
+# Machines per batched CBC model. One model for a whole part is slower than small ones:
+# measured on input.txt (170 machines), part 1 took 1.7s one machine per CBC call, ~1.0s
+# in chunks of 4-8 and 2.5-3.0s as a single model, where the mod-2 `k` variables make
+# one global branch-and-bound harder than many small ones. Part 2 took 0.75-0.9s one per
+# call, ~0.2s in chunks of 8-32 and 0.3-0.4s as a single model.
+BATCH_CHUNK_SIZES = {1: 8, 2: 16}
+
+
+def solve_batched(
+    lines: List[str],
+    part: int,
+    threads: Optional[int] = None,
+    cache: Optional[SolutionCache] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Solve one part with batched ILPs, reporting each machine like the sequential solvers.
+
+    Machines go to CBC in chunks of chunk_size (default BATCH_CHUNK_SIZES[part]). With a
+    cache, only the misses are batched and their answers are stored.
+    """
+    numbered = [(line_num, parse_machine(line)) for line_num, line in enumerate(lines, 1) if line.strip()]
+    results = [None] * len(numbered)
+    misses = []  # (position, key)
+    for pos, (_, machine) in enumerate(numbered):
+        key = canonical_key(part, machine) if cache is not None else None
+        if key is not None:
+            results[pos] = cache.get(key)
+        if results[pos] is None:
+            misses.append((pos, key))
+
+    chunk_size = chunk_size or BATCH_CHUNK_SIZES[part]
+    for start in range(0, len(misses), chunk_size):
+        chunk = misses[start : start + chunk_size]
+        solved = solve_machines_batched_ilp([numbered[pos][1] for pos, _ in chunk], part, threads=threads)
+        for (pos, key), min_presses in zip(chunk, solved):
+            results[pos] = min_presses
+            if key is not None:
+                cache.put(key, min_presses)
+
+    return sum(report_machine(line_num, min_presses) for (line_num, _), min_presses in zip(numbered, results))
+
+
+def main(
+    filename: str = "input_test.txt",
+    use_ilp: bool = False,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    batch: bool = False,
+    threads: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    cache_path: Optional[Path] = None,
+    use_cache: bool = False,
+):
+    """
+    Run both parts.
+
+    Passing workers or timeout switches to the multi-process mode; batch solves each part
+    as combined ILPs of chunk_size machines (optionally with CBC threads). use_cache memoises machine answers
+    in every mode, in memory only or also in the SQLite file at cache_path.
+    """
     print(f"Processing file: {filename}")
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
@@ -213,17 +817,60 @@ def main(filename: str = "input_test.txt"):
     with open(file_path, "r") as file:
         lines = file.readlines()
 
+    parallel = workers is not None or timeout is not None
+    cache = SolutionCache(cache_path) if use_cache or cache_path is not None else None
+
     print("\n=== Part 1: Light Configuration ===")
-    result1 = solve_part1(lines)
+    if batch:
+        result1 = solve_batched(lines, 1, threads=threads, cache=cache, chunk_size=chunk_size)
+    elif parallel:
+        result1 = solve_parallel(lines, 1, workers=workers, timeout=timeout, use_ilp=use_ilp, cache=cache)
+    else:
+        result1 = solve_part1(lines, use_ilp=use_ilp, cache=cache)
     print(f"Total minimum button presses: {result1}")
 
     print("\n=== Part 2: Joltage Configuration ===")
-    result2 = solve_part2(lines)
+    if batch:
+        result2 = solve_batched(lines, 2, threads=threads, cache=cache, chunk_size=chunk_size)
+    elif parallel:
+        result2 = solve_parallel(lines, 2, workers=workers, timeout=timeout, use_ilp=use_ilp, cache=cache)
+    else:
+        result2 = solve_part2(lines, use_ilp=use_ilp, cache=cache)
     print(f"Total minimum button presses: {result2}")
 
+    if cache is not None:
+        print(f"\nSolution cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        main(sys.argv[1])
-    else:
-        main()
+    # Usage: day10.py [filename] [--ilp] [--workers=N] [--timeout=SECONDS] [--batch [--threads=N] [--chunk=N]]
+    #        [--cache[=PATH]]
+    #   --ilp solves with pulp/CBC instead of the native solvers
+    #   --batch solves the machines of a part as combined CBC models of --chunk=N machines
+    #   --cache[=PATH] memoises machine answers (default: .solution_cache.sqlite3 next to this script;
+    #   --cache=:memory: keeps them in the in-process LRU only)
+    filename = "input_test.txt"
+    options = {}
+    for arg in sys.argv[1:]:
+        if arg == "--ilp":
+            options["use_ilp"] = True
+        elif arg.startswith("--workers="):
+            options["workers"] = int(arg.split("=", 1)[1])
+        elif arg == "--cache":
+            options["cache_path"] = Path(__file__).resolve().parent / ".solution_cache.sqlite3"
+        elif arg == "--cache=:memory:":
+            options["use_cache"] = True
+        elif arg.startswith("--cache="):
+            options["cache_path"] = Path(arg.split("=", 1)[1])
+        elif arg == "--batch":
+            options["batch"] = True
+        elif arg.startswith("--chunk="):
+            options["chunk_size"] = int(arg.split("=", 1)[1])
+        elif arg.startswith("--threads="):
+            options["threads"] = int(arg.split("=", 1)[1])
+        elif arg.startswith("--timeout="):
+            options["timeout"] = float(arg.split("=", 1)[1])
+        else:
+            filename = arg
+    main(filename, **options)
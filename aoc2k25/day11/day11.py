@@ -1,5 +1,10 @@
+import hashlib
+import struct
 import sys
+from array import array
+from collections import deque
 from functools import lru_cache
+from itertools import permutations
 from pathlib import Path
 
 
@@ -49,34 +54,487 @@ def count_paths(graph, start, end, must_visit=None):
     return dfs(start, 0)
 
 
+class CSRGraph:
+    """
+    Compact adjacency for the device graph.
+
+    Node names are interned to ids 0..n-1 and edges are stored in compressed sparse row
+    form: the successors of node u are targets[offsets[u] : offsets[u + 1]]. Both buffers
+    are array('i'), so an edge costs 4 bytes.
+    """
+
+    SNAPSHOT_MAGIC = b"CSR2"
+    DIGEST_SIZE = 32
+
+    def __init__(self, names, offsets, targets):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Build straight from the text stream ("aaa: bbb ccc" lines), without an intermediate dict."""
+        ids = {}
+        names = []
+        edge_src = array("i")
+        edge_dst = array("i")
+
+        def intern(name):
+            node = ids.get(name)
+            if node is None:
+                node = ids[name] = len(names)
+                names.append(name)
+            return node
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            name, rest = line.split(":")
+            src = intern(name.strip())
+            for target in rest.split():
+                edge_src.append(src)
+                edge_dst.append(intern(target))
+
+        return cls._from_edges(names, edge_src, edge_dst)
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        """Build from a parse_graph style dict[str, list[str]]."""
+        return cls.from_lines(f"{name}: {' '.join(targets)}" for name, targets in graph.items())
+
+    @classmethod
+    def _from_edges(cls, names, edge_src, edge_dst):
+        # Counting sort of the edges by source node
+        offsets = array("i", [0]) * (len(names) + 1)
+        for src in edge_src:
+            offsets[src + 1] += 1
+        for node in range(len(names)):
+            offsets[node + 1] += offsets[node]
+
+        targets = array("i", [0]) * len(edge_dst)
+        cursor = array("i", offsets[:-1])
+        for src, dst in zip(edge_src, edge_dst):
+            targets[cursor[src]] = dst
+            cursor[src] += 1
+
+        return cls(names, offsets, targets)
+
+    def successors(self, node):
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def save(self, path, source_digest=bytes(DIGEST_SIZE)):
+        """
+        Write a binary snapshot: header, offsets, targets, then newline-joined names.
+
+        The header carries source_digest (SHA-256 of the input the graph was built from)
+        so a snapshot can be matched against its input before it is trusted.
+        """
+        encoded_names = "\n".join(self.names).encode()
+        with open(path, "wb") as f:
+            f.write(self.SNAPSHOT_MAGIC)
+            f.write(source_digest)
+            f.write(struct.pack("<qqq", len(self.names), len(self.targets), len(encoded_names)))
+            f.write(self.offsets.tobytes())
+            f.write(self.targets.tobytes())
+            f.write(encoded_names)
+
+    @classmethod
+    def snapshot_digest(cls, path):
+        """Source digest stored in a snapshot's header, or None if the file is not a snapshot."""
+        with open(path, "rb") as f:
+            if f.read(len(cls.SNAPSHOT_MAGIC)) != cls.SNAPSHOT_MAGIC:
+                return None
+            return f.read(cls.DIGEST_SIZE)
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot written by save()."""
+        with open(path, "rb") as f:
+            if f.read(len(cls.SNAPSHOT_MAGIC)) != cls.SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a graph snapshot")
+            f.read(cls.DIGEST_SIZE)
+            num_nodes, num_edges, names_size = struct.unpack("<qqq", f.read(24))
+            offsets = array("i")
+            offsets.frombytes(f.read((num_nodes + 1) * offsets.itemsize))
+            targets = array("i")
+            targets.frombytes(f.read(num_edges * targets.itemsize))
+            names = f.read(names_size).decode().split("\n") if num_nodes else []
+        return cls(names, offsets, targets)
+
+
+class TopoPathCounter:
+    """
+    Iterative path counting over a DAG.
+
+    Works on a CSRGraph (a parse_graph dict is converted) and topologically sorts it once
+    (Kahn's algorithm); each query is then a single DP sweep in reverse topological order over
+    per-node arrays, with no recursion and no string hashing in the inner loop.
+    """
+
+    def __init__(self, graph):
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        self.graph = graph
+        self.ids = graph.ids
+        self.names = graph.names
+        self.order = self._topological_order()
+        self._paths_to_cache = {}
+
+    def _topological_order(self):
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        indegree = array("i", [0]) * len(self.names)
+        for t in targets:
+            indegree[t] += 1
+
+        queue = deque(node for node, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for k in range(offsets[node], offsets[node + 1]):
+                t = targets[k]
+                indegree[t] -= 1
+                if indegree[t] == 0:
+                    queue.append(t)
+
+        if len(order) != len(self.names):
+            raise ValueError("Graph contains a cycle; path counts are not finite")
+        return order
+
+    def count(self, start, end, must_visit=None):
+        """
+        Count all paths from start -> end.
+        If must_visit is provided (list or set), count only paths that visit all of them.
+
+        Each node carries a vector indexed by the subset of must-visit nodes seen from that
+        node onwards, so one sweep answers the constrained query.
+        """
+        must_visit = list(must_visit or [])
+        if start not in self.ids or end not in self.ids:
+            # Only the empty path start == end can exist outside the graph
+            return int(start == end and set(must_visit) <= {start})
+
+        bits = [0] * len(self.names)
+        for i, node in enumerate(must_visit):
+            if node in self.ids:
+                bits[self.ids[node]] |= 1 << i
+        num_masks = 1 << len(must_visit)
+        full_mask = num_masks - 1
+
+        start_id = self.ids[start]
+        end_id = self.ids[end]
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        # ways[node][mask] = paths node -> end that visit exactly `mask` of the must-visit nodes
+        ways = [None] * len(self.names)
+        zero = [0] * num_masks
+
+        for node in reversed(self.order):
+            acc = [0] * num_masks
+            if node == end_id:
+                acc[0] = 1
+            else:
+                for k in range(offsets[node], offsets[node + 1]):
+                    child = ways[targets[k]]
+                    if child is not zero:
+                        for mask in range(num_masks):
+                            acc[mask] += child[mask]
+
+            bit = bits[node]
+            if bit:
+                shifted = [0] * num_masks
+                for mask in range(num_masks):
+                    shifted[mask | bit] += acc[mask]
+                acc = shifted
+
+            ways[node] = acc if any(acc) else zero
+            if node == start_id:
+                break
+
+        return ways[start_id][full_mask]
+
+    def paths_to(self, target):
+        """
+        Number of paths from every node to target, indexed by node id.
+
+        Computed with one reverse-topological sweep and cached per target, so every query
+        ending at (or passing through) the same node shares it.
+        """
+        target_id = self.ids[target]
+        cached = self._paths_to_cache.get(target_id)
+        if cached is not None:
+            return cached
+
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        counts = [0] * len(self.names)
+        counts[target_id] = 1
+        for node in reversed(self.order):
+            if node == target_id:
+                continue
+            total = 0
+            for k in range(offsets[node], offsets[node + 1]):
+                total += counts[targets[k]]
+            counts[node] = total
+
+        self._paths_to_cache[target_id] = counts
+        return counts
+
+    def count_many(self, queries):
+        """
+        Answer many (start, end, must_visit) queries.
+
+        In a DAG a path meets its must-visit nodes in exactly one order, so a constrained
+        count is the sum, over every order of the waypoints, of the product of segment
+        counts (e.g. svr->dac->fft->out plus svr->fft->dac->out). Each segment is read from
+        the shared paths_to vector of its endpoint.
+        """
+        results = []
+        for start, end, must_visit in queries:
+            waypoints = list(dict.fromkeys(must_visit or []))
+            if any(name not in self.ids for name in [start, end, *waypoints]):
+                results.append(self.count(start, end, waypoints))
+                continue
+
+            total = 0
+            for order in permutations(waypoints):
+                stops = [start, *order, end]
+                product = 1
+                for a, b in zip(stops, stops[1:]):
+                    product *= self.paths_to(b)[self.ids[a]]
+                    if not product:
+                        break
+                total += product
+            results.append(total)
+        return results
+
+
+class DynamicPathCounter:
+    """
+    Maintains the number of source -> sink paths while edges are inserted.
+
+    Keeps forward counts (paths source -> node) and backward counts (paths node -> sink)
+    over a topological order. Inserting u -> v adds forward[u] * backward[v] paths; only
+    the nodes downstream of v (forward) and upstream of u (backward) are updated, in
+    topological order. An insertion that breaks the current order, and any deletion,
+    falls back to a full recompute; an insertion that closes a cycle is rejected with
+    ValueError and leaves the graph unchanged.
+    """
+
+    def __init__(self, graph, source, sink):
+        if isinstance(graph, CSRGraph):
+            names = list(graph.names)
+            successors = [list(graph.successors(node)) for node in range(len(names))]
+        else:
+            csr = CSRGraph.from_adjacency(graph)
+            names = list(csr.names)
+            successors = [list(csr.successors(node)) for node in range(len(names))]
+
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.successors = successors
+        self.predecessors = [[] for _ in names]
+        for node, targets in enumerate(successors):
+            for t in targets:
+                self.predecessors[t].append(node)
+
+        self.source = self._intern(source)
+        self.sink = self._intern(sink)
+        self.recompute()
+
+    @property
+    def total(self):
+        """Number of paths from source to sink."""
+        return self.forward[self.sink]
+
+    def _intern(self, name):
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.successors.append([])
+            self.predecessors.append([])
+            if hasattr(self, "order"):
+                # An isolated node can go anywhere in the order; put it last
+                self.position.append(len(self.order))
+                self.order.append(node)
+                self.forward.append(0)
+                self.backward.append(0)
+        return node
+
+    def recompute(self):
+        """Rebuild the topological order and both count vectors from scratch."""
+        indegree = [len(preds) for preds in self.predecessors]
+        queue = deque(node for node, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for t in self.successors[node]:
+                indegree[t] -= 1
+                if indegree[t] == 0:
+                    queue.append(t)
+        if len(order) != len(self.names):
+            raise ValueError("Graph contains a cycle; path counts are not finite")
+
+        self.order = order
+        self.position = [0] * len(order)
+        for pos, node in enumerate(order):
+            self.position[node] = pos
+
+        self.forward = [0] * len(order)
+        self.forward[self.source] = 1
+        for node in order:
+            if node != self.source:
+                self.forward[node] = sum(self.forward[p] for p in self.predecessors[node])
+
+        self.backward = [0] * len(order)
+        self.backward[self.sink] = 1
+        for node in reversed(order):
+            if node != self.sink:
+                self.backward[node] = sum(self.backward[t] for t in self.successors[node])
+
+    def _reachable(self, start, neighbours):
+        """All nodes reachable from start (inclusive) following the given adjacency."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for nxt in neighbours[node]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def insert_edge(self, u_name, v_name):
+        """Add the edge u -> v and update the path counts."""
+        u = self._intern(u_name)
+        v = self._intern(v_name)
+
+        self.successors[u].append(v)
+        self.predecessors[v].append(u)
+
+        if self.position[u] >= self.position[v]:
+            # The order no longer holds (or u == v): rebuild, undoing the edge on a cycle
+            try:
+                self.recompute()
+            except ValueError:
+                self.successors[u].pop()
+                self.predecessors[v].pop()
+                raise
+            return
+
+        forward_u = self.forward[u]
+        backward_v = self.backward[v]
+
+        # Downstream of v: forward[y] += forward[u] * (paths v -> y)
+        if forward_u:
+            downstream = sorted(self._reachable(v, self.successors), key=self.position.__getitem__)
+            paths_from_v = {v: 1}
+            for y in downstream:
+                if y != v:
+                    paths_from_v[y] = sum(paths_from_v.get(p, 0) for p in self.predecessors[y])
+                if y != self.source:
+                    self.forward[y] += forward_u * paths_from_v[y]
+
+        # Upstream of u: backward[x] += (paths x -> u) * backward[v]
+        if backward_v:
+            upstream = sorted(self._reachable(u, self.predecessors), key=self.position.__getitem__, reverse=True)
+            paths_to_u = {u: 1}
+            for x in upstream:
+                if x != u:
+                    paths_to_u[x] = sum(paths_to_u.get(t, 0) for t in self.successors[x])
+                if x != self.sink:
+                    self.backward[x] += paths_to_u[x] * backward_v
+
+    def delete_edge(self, u_name, v_name):
+        """Remove one u -> v edge and recompute the counts from scratch."""
+        u = self.ids[u_name]
+        v = self.ids[v_name]
+        self.successors[u].remove(v)
+        self.predecessors[v].remove(u)
+        self.recompute()
+
+
 # ---------------------------------------------------------------------
 
 
-def main(filename: str = "input_test.txt"):
+def load_csr_graph(file_path, snapshot_path=None):
+    """
+    Load a CSRGraph from a snapshot if one exists for this input, else from the text file.
+
+    The snapshot is keyed by a SHA-256 of the input file; a missing, foreign or stale
+    snapshot is rebuilt from the text and overwritten.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    digest = hashlib.sha256(data).digest()
+
+    if snapshot_path is not None and Path(snapshot_path).exists():
+        if CSRGraph.snapshot_digest(snapshot_path) == digest:
+            return CSRGraph.load(snapshot_path)
+        print(f"Snapshot {snapshot_path} does not match {file_path}, rebuilding")
+
+    graph = CSRGraph.from_lines(data.decode().splitlines())
+
+    if snapshot_path is not None:
+        graph.save(snapshot_path, digest)
+    return graph
+
+
+def main(filename: str = "input_test.txt", engine: str = "dfs", snapshot_path=None):
     print(f"Processing file: {filename}")
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
 
-    with open(file_path, "r") as file:
-        lines = file.readlines()
+    if engine == "topo":
+        graph = load_csr_graph(file_path, snapshot_path)
+        counter = TopoPathCounter(graph)
+
+        def count(start, end, must_visit=None):
+            return counter.count_many([(start, end, must_visit)])[0]
+    else:
+        with open(file_path, "r") as file:
+            lines = file.readlines()
 
-    graph = parse_graph(lines)
+        graph = parse_graph(lines)
+
+        def count(start, end, must_visit=None):
+            return count_paths(graph, start, end, must_visit)
 
     # --------------------- PART 1 ---------------------
     if "you" in graph:
-        part1 = count_paths(graph, "you", "out")
+        part1 = count("you", "out")
         print(f"Part 1: Number of paths from 'you' to 'out' = {part1}")
 
     # --------------------- PART 2 ---------------------
     if "svr" in graph:
-        part2 = count_paths(graph, "svr", "out", {"dac", "fft"})
+        part2 = count("svr", "out", {"dac", "fft"})
         print(f"Part 2: Number of paths from 'svr' to 'out' visiting dac and fft = {part2}")
 
     print("Done.")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        main(sys.argv[1])
-    else:
-        main()
+    # Usage: day11.py [filename] [--engine=dfs|topo] [--snapshot=PATH]
+    #   --snapshot caches the topo engine's CSR graph in a binary file
+    filename = "input_test.txt"
+    engine = "dfs"
+    snapshot_path = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--engine="):
+            engine = arg.split("=", 1)[1]
+        elif arg.startswith("--snapshot="):
+            snapshot_path = arg.split("=", 1)[1]
+        else:
+            filename = arg
+    main(filename, engine=engine, snapshot_path=snapshot_path)
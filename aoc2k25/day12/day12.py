@@ -2,6 +2,7 @@
 import re
 import sys
 import time
+from array import array
 from collections import defaultdict
 from pathlib import Path
 
@@ -129,6 +130,59 @@ def unique_placements_for_shape(sh_rows, W, H):
     return placements
 
 
+# ---------- Pre-screen (cheap bounds before any search) ----------
+def checkerboard_splits(coords):
+    """
+    Possible numbers of "black" cells (x + y even) a shape covers on a checkerboard,
+    over every orientation and both translation parities.
+    """
+    n = len(coords)
+    splits = set()
+    for orient in all_orientations(coords):
+        black = sum(1 for x, y in orient if (x + y) % 2 == 0)
+        splits.add(black)
+        splits.add(n - black)
+    return splits
+
+
+def prescreen_region(W, H, shapes, counts):
+    """
+    Decide a region from cheap bounds, in order:
+      - area: the presents need more cells than the region has -> does not fit
+      - block capacity: every present fits in a b x b block and the region holds
+        at least as many disjoint blocks as presents -> fits
+      - parity: no choice of checkerboard split per present keeps both the black and
+        the white cells used within what the region offers -> does not fit
+    Returns: (verdict, reason) with verdict True/False, or (None, "ambiguous") when a
+    search is still needed.
+    """
+    used = [(t, c) for t, c in enumerate(counts) if c > 0]
+    if not used:
+        return True, "empty"
+    coords = {t: shape_coords_from_rows(shapes[t]) for t, _ in used}
+
+    total_cells = sum(len(coords[t]) * c for t, c in used)
+    if total_cells > W * H:
+        return False, "area"
+
+    block = max(max(bbox(normalize(coords[t]))) for t, _ in used)
+    if (W // block) * (H // block) >= sum(c for _, c in used):
+        return True, "block capacity"
+
+    black_cells = (W * H + 1) // 2
+    white_cells = W * H - black_cells
+    # Reachable totals of black cells covered, one present at a time
+    reachable = {0}
+    for t, c in used:
+        splits = checkerboard_splits(coords[t])
+        for _ in range(c):
+            reachable = {r + k for r in reachable for k in splits}
+    if not any(total_cells - white_cells <= r <= black_cells for r in reachable):
+        return False, "parity"
+
+    return None, "ambiguous"
+
+
 # ---------- Bitmask backtracking solver ----------
 def can_pack_bitmask(W, H, shapes, counts, placements_cache=None):
     """
@@ -368,6 +422,270 @@ class DLX:
         return False
 
 
+# ---------- Array-backed DLX ----------
+class ArrayDLX:
+    """
+    Dancing Links with every link stored in flat parallel buffers indexed by node id.
+
+    Node 0 is the root, nodes 1..ncols are column headers (column i is node i + 1) and
+    the rest are matrix entries. Only required columns are linked into the header ring;
+    optional columns keep self-links, so they constrain rows without ever being chosen.
+
+    The node buffers L/R/U/D/C and the row ids are array('i'), 4 bytes per link instead of
+    a list slot plus a boxed int. Column sizes S, one per column, stay a list. Subclasses
+    can trade memory for speed through link_buffer: CPython specialises list indexing but
+    not array indexing, so cover/uncover run about 3x faster on lists.
+    """
+
+    @staticmethod
+    def link_buffer(values):
+        """Storage for one node buffer (L/R/U/D/C)."""
+        return array("i", values)
+
+    def __init__(self, ncols, required_col_indices):
+        n = ncols + 1
+        self.ncols = ncols
+        self.L = self.link_buffer(range(n))
+        self.R = self.link_buffer(range(n))
+        self.U = self.link_buffer(range(n))
+        self.D = self.link_buffer(range(n))
+        self.C = self.link_buffer(range(n))
+        self.S = [0] * n
+        self.row_of = array("i", [-1]) * n
+
+        # Header ring: root <-> required columns in index order
+        last = 0
+        for ci in sorted(required_col_indices):
+            col = ci + 1
+            self.L[col] = last
+            self.R[last] = col
+            last = col
+        self.R[last] = 0
+        self.L[0] = last
+
+    def add_row(self, row_id, col_indices):
+        U, D, S = self.U, self.D, self.S
+        first = len(self.C)
+        last = first + len(col_indices) - 1
+        if last < first:
+            return
+
+        # Row ring: consecutive node ids, wrapping around
+        self.L.append(last)
+        self.L.extend(range(first, last))
+        self.R.extend(range(first + 1, last + 1))
+        self.R.append(first)
+        self.row_of.extend([row_id] * len(col_indices))
+
+        # Insert each node at the bottom of its column
+        node = first
+        for ci in col_indices:
+            col = ci + 1
+            self.C.append(col)
+            U.append(U[col])
+            D.append(col)
+            D[U[col]] = node
+            U[col] = node
+            S[col] += 1
+            node += 1
+
+    def _cover_ops(self):
+        """
+        Build cover/uncover closures over the link buffers.
+
+        Binding the buffers as defaults makes them fast locals instead of attribute
+        lookups on every call.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+
+        def cover(col, L=L, R=R, U=U, D=D, C=C, S=S):
+            R[L[col]] = R[col]
+            L[R[col]] = L[col]
+            i = D[col]
+            while i != col:
+                j = R[i]
+                while j != i:
+                    D[U[j]] = D[j]
+                    U[D[j]] = U[j]
+                    S[C[j]] -= 1
+                    j = R[j]
+                i = D[i]
+
+        def uncover(col, L=L, R=R, U=U, D=D, C=C, S=S):
+            i = U[col]
+            while i != col:
+                j = L[i]
+                while j != i:
+                    S[C[j]] += 1
+                    D[U[j]] = j
+                    U[D[j]] = j
+                    j = L[j]
+                i = U[i]
+            R[L[col]] = col
+            L[R[col]] = col
+
+        return cover, uncover
+
+    def search(self):
+        """
+        Iterative Algorithm X with an explicit stack of chosen row nodes.
+
+        Returns True as soon as every required column is covered.
+        """
+        L, R, D, C, S = self.L, self.R, self.D, self.C, self.S
+        cover, uncover = self._cover_ops()
+
+        stack = []
+
+        while True:
+            # Descend: pick the required column with the fewest rows
+            if R[0] == 0:
+                return True
+            col = R[0]
+            best = col
+            while col != 0:
+                if S[col] < S[best]:
+                    best = col
+                col = R[col]
+
+            if S[best]:
+                cover(best)
+                row = D[best]
+                j = R[row]
+                while j != row:
+                    cover(C[j])
+                    j = R[j]
+                stack.append(row)
+                continue
+
+            # Backtrack: move the deepest choice to its next row, popping exhausted levels
+            while stack:
+                row = stack.pop()
+                j = L[row]
+                while j != row:
+                    uncover(C[j])
+                    j = L[j]
+                col = C[row]
+                row = D[row]
+                if row != col:
+                    j = R[row]
+                    while j != row:
+                        cover(C[j])
+                        j = R[j]
+                    stack.append(row)
+                    break
+                uncover(col)
+            else:
+                return False
+
+
+class MultiplicityDLX(ArrayDLX):
+    """
+    ArrayDLX generalised to primary columns that must be hit an exact number of times.
+
+    Each required column carries a remaining demand; it stays in the header ring until
+    the demand drops to zero and only then is covered. Rows tried and rejected at a
+    level are hidden for the rest of that level, so the rows picked for one column come
+    out in column order and each combination is explored once instead of once per
+    permutation of interchangeable copies.
+
+    Its model has one row per placement rather than one per placement and instance, so
+    it keeps the faster list link buffers: about 3x quicker cover/uncover for a matrix
+    already a fraction of the size.
+    """
+
+    link_buffer = staticmethod(list)
+
+    def __init__(self, ncols, demands):
+        super().__init__(ncols, demands)
+        self.need = [0] * (ncols + 1)
+        for ci, count in demands.items():
+            self.need[ci + 1] = count
+
+    def search(self):
+        """
+        Iterative search over (column, row, hidden rows) frames.
+
+        Returns True as soon as every demand is met.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        need = self.need
+        cover, uncover = self._cover_ops()
+
+        def hide(row, R=R, U=U, D=D, C=C, S=S):
+            j = row
+            while True:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+                if j == row:
+                    break
+
+        def unhide(row, L=L, U=U, D=D, C=C, S=S):
+            j = row
+            while True:
+                j = L[j]
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                if j == row:
+                    break
+
+        def select(col, row):
+            j = R[row]
+            while j != row:
+                cover(C[j])
+                j = R[j]
+            need[col] -= 1
+            if not need[col]:
+                cover(col)
+
+        def deselect(col, row):
+            if not need[col]:
+                uncover(col)
+            need[col] += 1
+            j = L[row]
+            while j != row:
+                uncover(C[j])
+                j = L[j]
+
+        stack = []
+
+        while True:
+            # Descend: pick the column with the least slack between rows left and demand
+            if R[0] == 0:
+                return True
+            col = R[0]
+            best = col
+            while col != 0:
+                if S[col] - need[col] < S[best] - need[best]:
+                    best = col
+                col = R[col]
+
+            if S[best] >= need[best]:
+                row = D[best]
+                select(best, row)
+                stack.append((best, row, []))
+                continue
+
+            # Backtrack: reject the deepest choice and try the next row below it
+            while stack:
+                col, row, hidden = stack.pop()
+                deselect(col, row)
+                hide(row)
+                hidden.append(row)
+                row = D[row]
+                if row != col and S[col] >= need[col]:
+                    select(col, row)
+                    stack.append((col, row, hidden))
+                    break
+                for row in reversed(hidden):
+                    unhide(row)
+            else:
+                return False
+
+
 def build_exact_cover_model(W, H, shapes, counts):
     """
     Build exact-cover matrix columns:
@@ -433,7 +751,37 @@ def build_exact_cover_model(W, H, shapes, counts):
     return next_col, rows_cols, set(instance_cols)
 
 
-def can_pack_dlx(W, H, shapes, counts):
+def build_multiplicity_cover_model(W, H, shapes, counts):
+    """
+    Build an exact-cover matrix with one demand column per shape type:
+      - cell columns: 0..(W*H-1), optional (each cell used at most once)
+      - counter columns: one per shape t with count > 0, which must be hit exactly count times
+    Rows:
+      One row per unique placement of shape t: its cell columns plus the counter column of t.
+      Unlike build_exact_cover_model, placements are not duplicated per instance.
+    Returns: (ncols, list_of_rows, demands) where demands maps counter column -> count
+    """
+    next_col = W * H
+    rows_cols = []
+    demands = {}
+    for t, c in enumerate(counts):
+        if c <= 0:
+            continue
+        counter_col = next_col
+        next_col += 1
+        demands[counter_col] = c
+        for mask in unique_placements_for_shape(shapes[t], W, H):
+            cols = []
+            while mask:
+                low = mask & -mask
+                cols.append(low.bit_length() - 1)
+                mask ^= low
+            cols.append(counter_col)
+            rows_cols.append(cols)
+    return next_col, rows_cols, demands
+
+
+def can_pack_dlx(W, H, shapes, counts, engine="multiplicity"):
     # quick area check
     total_needed = 0
     for t, cnt in enumerate(counts):
@@ -443,6 +791,13 @@ def can_pack_dlx(W, H, shapes, counts):
     if total_needed > W * H:
         return False
 
+    if engine == "multiplicity":
+        ncols, rows_cols, demands = build_multiplicity_cover_model(W, H, shapes, counts)
+        dlx = MultiplicityDLX(ncols, demands)
+        for ridx, cols in enumerate(rows_cols):
+            dlx.add_row(ridx, cols)
+        return dlx.search()
+
     ncols, rows_cols, required_instance_cols = build_exact_cover_model(W, H, shapes, counts)
     if not required_instance_cols:
         return True
@@ -455,6 +810,12 @@ def can_pack_dlx(W, H, shapes, counts):
         if possible_rows_by_col[rc] == 0:
             return False
 
+    if engine == "array":
+        dlx = ArrayDLX(ncols, required_instance_cols)
+        for ridx, cols in enumerate(rows_cols):
+            dlx.add_row(ridx, cols)
+        return dlx.search()
+
     dlx = DLX(ncols)
     for ridx, cols in enumerate(rows_cols):
         dlx.add_row(ridx, cols)
@@ -485,7 +846,7 @@ def remap_counts_line(counts_line, key_map, n_shapes):
     return counts
 
 
-def main(filename="input_test.txt", only=None):
+def main(filename="input_test.txt", only=None, dlx_engine="multiplicity", prescreen=True):
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
     with open(file_path, "r") as f:
@@ -502,11 +863,27 @@ def main(filename="input_test.txt", only=None):
 
     total_fit_bitmask = 0
     total_fit_dlx = 0
+    total_fit_prescreen = 0
+    searched = 0
+    screened = defaultdict(int)  # reason -> regions decided without a search
 
     for W, H, counts_line in regions:
         counts = remap_counts_line(counts_line, key_map, n_shapes)
         print(f"\nRegion {W}x{H} counts={counts}")
 
+        if prescreen:
+            verdict, reason = prescreen_region(W, H, shapes_mapped, counts)
+            if verdict is None:
+                print(f"  Pre-screen:     {reason}")
+            else:
+                print(f"  Pre-screen:     {'fits' if verdict else 'does NOT fit'} ({reason})")
+                screened[reason] += 1
+                if verdict:
+                    total_fit_prescreen += 1
+                continue
+
+        searched += 1
+
         # run bitmask solver
         t0 = time.perf_counter()
         try:
@@ -523,23 +900,35 @@ def main(filename="input_test.txt", only=None):
 
         # run DLX solver
         t0 = time.perf_counter()
-        ok_dlx = can_pack_dlx(W, H, shapes_mapped, counts)
+        ok_dlx = can_pack_dlx(W, H, shapes_mapped, counts, engine=dlx_engine)
         t1 = time.perf_counter()
         print(f"  DLX solver:     {'fits' if ok_dlx else 'does NOT fit'} (time {t1 - t0:.4f}s)")
         if ok_dlx:
             total_fit_dlx += 1
 
     print("\nSummary:")
-    print(f"  Bitmask solver found {total_fit_bitmask} packable regions")
+    if prescreen:
+        decided = ", ".join(f"{reason}: {n}" for reason, n in sorted(screened.items()))
+        print(
+            f"  Pre-screen decided {sum(screened.values())} regions ({decided or 'none'}), "
+            f"{total_fit_prescreen} packable"
+        )
+    print(f"  Bitmask solver found {total_fit_bitmask} packable regions of {searched} searched")
     if only != "bitmask":
-        print(f"  DLX solver found     {total_fit_dlx} packable regions")
-    return total_fit_bitmask, total_fit_dlx
+        print(f"  DLX solver found     {total_fit_dlx} packable regions of {searched} searched")
+    # Overall answers, pre-screen verdicts included
+    total_bitmask = total_fit_prescreen + total_fit_bitmask
+    total_dlx = total_fit_prescreen + total_fit_dlx
+    print(f"  Packable regions in total: {total_bitmask}" + (f" (DLX: {total_dlx})" if only != "bitmask" else ""))
+    return total_bitmask, total_dlx
 
 
 # ---------- CLI ----------
 if __name__ == "__main__":
     args = sys.argv[1:]
     only = None
+    dlx_engine = "multiplicity"
+    prescreen = True
     filename = "input_test.txt"
     if args:
         for a in args:
@@ -547,6 +936,11 @@ if __name__ == "__main__":
                 only = "bitmask"
             elif a == "--only-dlx":
                 only = "dlx"
+            elif a == "--no-prescreen":
+                prescreen = False
+            elif a.startswith("--dlx-engine="):
+                # "multiplicity" (counter columns), "array" (flat buffers) or "linked" (DLXNode objects)
+                dlx_engine = a.split("=", 1)[1]
             else:
                 filename = a
-    main(filename, only)
+    main(filename, only, dlx_engine, prescreen)
@@ -1,3 +1,4 @@
+import mmap
 import operator
 import sys
 from pathlib import Path
@@ -84,9 +85,94 @@ def solve_puzzle(data_lines, extracted_operators, column_ranges):
     return puzzle_answer
 
 
-def main(filename: str = "input_test.txt"):
+def worksheet_geometry(buf) -> Tuple[int, int, int]:
+    """
+    Describe a worksheet buffer as a 2D byte array of fixed-width rows.
+
+    Every row must have the same width; the final row may omit its line terminator.
+
+    Args:
+        buf: The raw worksheet bytes (a mmap or bytes object).
+
+    Returns:
+        A (width, stride, num_rows) tuple, where stride includes the line terminator.
+    """
+    size = len(buf)
+    newline = buf.find(b"\n")
+    if newline == -1:
+        return size, size, 1
+
+    width = newline
+    if width > 0 and buf[width - 1] == ord("\r"):
+        width -= 1
+    stride = newline + 1
+    terminator = stride - width
+
+    num_rows = (size + terminator) // stride
+    if size not in (num_rows * stride, num_rows * stride - terminator):
+        raise ValueError("Worksheet rows are not fixed width")
+
+    return width, stride, num_rows
+
+
+def solve_puzzle_mmap(file_path: Path) -> int:
+    """
+    Solve the worksheet by memory-mapping the file and reading it column by column.
+
+    Each column of the data rows is pulled out with one strided slice, and the
+    vertical number is built with positional arithmetic (value * 10 + digit).
+    A column of only spaces closes the current problem.
+
+    Args:
+        file_path: Path to a worksheet with fixed-width rows.
+
+    Returns:
+        The grand total of all problem answers.
+    """
+    with open(file_path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            width, stride, num_rows = worksheet_geometry(mm)
+            op_row_start = (num_rows - 1) * stride
+            data_end = op_row_start
+
+            puzzle_answer = 0
+            op = None
+            nums: List[int] = []
+
+            for col_idx in range(width):
+                op_char = mm[op_row_start + col_idx]
+                if op_char != 32:
+                    op = chr(op_char)
+
+                value = 0
+                has_digit = False
+                for char in mm[col_idx:data_end:stride]:
+                    if char != 32:
+                        value = value * 10 + (char - 48)
+                        has_digit = True
+
+                if has_digit:
+                    nums.append(value)
+                elif nums:
+                    puzzle_answer += apply_operation(op, nums)
+                    nums = []
+
+            if nums:
+                puzzle_answer += apply_operation(op, nums)
+
+    return puzzle_answer
+
+
+def main(filename: str = "input_test.txt", use_mmap: bool = False):
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
+
+    if use_mmap:
+        print(solve_puzzle_mmap(file_path))
+        return
+
     with open(file_path, "r") as f:
         test_input = f.readlines()
 
@@ -106,8 +192,11 @@ def main(filename: str = "input_test.txt"):
 
 
 if __name__ == "__main__":
-    # If a filename is provided as the first CLI argument, use it; otherwise use the default.
-    if len(sys.argv) > 1:
-        main(sys.argv[1])
+    # Usage: day6_p2.py [filename] [--mmap]
+    args = sys.argv[1:]
+    use_mmap = "--mmap" in args
+    filenames = [a for a in args if a != "--mmap"]
+    if filenames:
+        main(filenames[0], use_mmap=use_mmap)
     else:
-        main()
+        main(use_mmap=use_mmap)
@@ -1,4 +1,6 @@
+import heapq
 import sys
+from bisect import bisect_right
 from collections import defaultdict
 from pathlib import Path
 
@@ -55,6 +57,66 @@ def solve_tachyon_manifold(grid_input: list[str]) -> int:
     return split_count
 
 
+def row_bitmask(row: str, symbol: str) -> int:
+    """
+    Encodes the columns of a row holding `symbol` as an int bitmask.
+
+    Bit c of the result is set when row[c] == symbol.
+    """
+    row = row.rstrip("\n")
+    table = {ord(ch): "0" for ch in set(row)}
+    table[ord(symbol)] = "1"
+    return int(row[::-1].translate(table), 2) if row else 0
+
+
+def splitter_columns(row: str) -> list[int]:
+    """Returns the columns of a row that hold a splitter, in ascending order."""
+    columns = []
+    c = row.find("^")
+    while c != -1:
+        columns.append(c)
+        c = row.find("^", c + 1)
+    return columns
+
+
+def solve_tachyon_manifold_bitset(grid_input: list[str]) -> int:
+    """
+    Counts beam splits by advancing the whole beam frontier with bitwise ops.
+
+    Each row is reduced to a splitter mask and an empty-space mask, so a row costs
+    a handful of big-int operations instead of one lookup per active beam.
+
+    Args:
+        grid_input: A list of strings representing the tachyon manifold diagram.
+
+    Returns:
+        The total number of times a tachyon beam is split.
+    """
+    if not grid_input:
+        return 0
+
+    start_col = grid_input[0].find("S")
+    if start_col == -1:
+        return 0
+
+    width_mask = (1 << len(grid_input[0].rstrip("\n"))) - 1
+    beams = 1 << start_col
+    split_count = 0
+
+    for row in grid_input[1:]:
+        splitters = row_bitmask(row, "^")
+        empty = row_bitmask(row, ".")
+
+        hits = beams & splitters
+        split_count += hits.bit_count()
+        beams = ((beams & empty) | (hits << 1) | (hits >> 1)) & width_mask
+
+        if not beams:
+            break
+
+    return split_count
+
+
 def quantum_split(grid_input, start_col):
     R = len(grid_input)
     C = len(grid_input[0])
@@ -100,6 +162,45 @@ def quantum_split(grid_input, start_col):
     return total_completed_timelines
 
 
+def quantum_split_array(grid_input: list[str], start_col: int) -> int:
+    """
+    Counts timelines with a fixed-size array of per-column counts.
+
+    Counts stay in one list of Python ints (so they never overflow) and each
+    splitter row is applied as a scatter-add over its splitter columns only;
+    rows without splitters cost nothing. Timelines that leave the left/right
+    edge are added to the completed total.
+    """
+    C = len(grid_input[0].rstrip("\n"))
+    counts = [0] * C
+    counts[start_col] = 1
+
+    total_completed_timelines = 0
+
+    for row in grid_input[1:]:
+        splitters = [c for c in splitter_columns(row) if counts[c]]
+        if not splitters:
+            continue
+
+        moving = [counts[c] for c in splitters]
+        for c in splitters:
+            counts[c] = 0
+
+        for c, count in zip(splitters, moving):
+            if c > 0:
+                counts[c - 1] += count
+            else:
+                total_completed_timelines += count
+
+            if c + 1 < C:
+                counts[c + 1] += count
+            else:
+                total_completed_timelines += count
+
+    total_completed_timelines += sum(counts)
+    return total_completed_timelines
+
+
 def solve_quantum_tachyon_manifold(grid_input):
     if not grid_input:
         return 0
@@ -114,7 +215,107 @@ def solve_quantum_tachyon_manifold(grid_input):
     return quantum_split(grid_input, start_col)
 
 
-def main(filename: str = "input_test.txt"):
+def solve_quantum_tachyon_manifold_array(grid_input: list[str]) -> int:
+    if not grid_input:
+        return 0
+
+    start_col = grid_input[0].find("S")
+    if start_col == -1:
+        return 0
+
+    return quantum_split_array(grid_input, start_col)
+
+
+def build_splitter_index(grid_input: list[str]) -> list[list[int]]:
+    """Returns, for each column, the sorted list of rows that hold a splitter."""
+    C = len(grid_input[0].rstrip("\n"))
+    column_rows = [[] for _ in range(C)]
+    for r in range(1, len(grid_input)):
+        for c in splitter_columns(grid_input[r]):
+            if c < C:
+                column_rows[c].append(r)
+    return column_rows
+
+
+def simulate_splitter_events(grid_input: list[str]) -> tuple[int, int]:
+    """
+    Runs both manifold modes as events that jump straight to the next splitter.
+
+    A group of timelines in a column is moved to the next splitter below it with
+    a bisect over that column's splitter rows. Splitters are processed from a heap
+    keyed by row, so every group arriving at a splitter is merged before it fires.
+    The cost depends on the number of splitters hit, not rows x beams.
+
+    Returns:
+        (split_count, total_timelines): the number of splitters reached by a beam
+        and the number of timelines that leave the manifold.
+    """
+    if not grid_input:
+        return 0, 0
+
+    start_col = grid_input[0].find("S")
+    if start_col == -1:
+        return 0, 0
+
+    column_rows = build_splitter_index(grid_input)
+    C = len(column_rows)
+
+    pending = {}
+    events = []
+    total_completed_timelines = 0
+
+    def send(c, after_row, count):
+        nonlocal total_completed_timelines
+        if not 0 <= c < C:
+            total_completed_timelines += count
+            return
+        rows = column_rows[c]
+        i = bisect_right(rows, after_row)
+        if i == len(rows):
+            total_completed_timelines += count
+            return
+        key = (rows[i], c)
+        if key in pending:
+            pending[key] += count
+        else:
+            pending[key] = count
+            heapq.heappush(events, key)
+
+    send(start_col, 0, 1)
+    split_count = 0
+
+    while events:
+        r, c = heapq.heappop(events)
+        count = pending.pop((r, c))
+        split_count += 1
+        send(c - 1, r, count)
+        send(c + 1, r, count)
+
+    return split_count, total_completed_timelines
+
+
+def solve_tachyon_manifold_events(grid_input: list[str]) -> int:
+    return simulate_splitter_events(grid_input)[0]
+
+
+def solve_quantum_tachyon_manifold_events(grid_input: list[str]) -> int:
+    return simulate_splitter_events(grid_input)[1]
+
+
+SPLIT_ENGINES = {
+    "scan": solve_tachyon_manifold,
+    "bitset": solve_tachyon_manifold_bitset,
+    "event": solve_tachyon_manifold_events,
+}
+
+TIMELINE_ENGINES = {
+    "scan": solve_quantum_tachyon_manifold,
+    "array": solve_quantum_tachyon_manifold_array,
+    "event": solve_quantum_tachyon_manifold_events,
+}
+
+
+def main(filename: str = "input_test.txt", split_engine: str = "scan", timeline_engine: str = "scan"):
     print(f"Processing file: {filename}")
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
@@ -122,16 +323,23 @@ def main(filename: str = "input_test.txt"):
     with open(file_path, "r") as file:
         lines = file.readlines()
 
-    total_splits = solve_tachyon_manifold(lines)
+    total_splits = SPLIT_ENGINES[split_engine](lines)
     print(f"Total splits: {total_splits}")
 
-    total_completed_timelines = solve_quantum_tachyon_manifold(lines)
+    total_completed_timelines = TIMELINE_ENGINES[timeline_engine](lines)
     print(f"Total timelines: {total_completed_timelines}")
 
 
 if __name__ == "__main__":
-    # If a filename is provided as the first CLI argument, use it; otherwise use the default.
-    if len(sys.argv) > 1:
-        main(sys.argv[1])
-    else:
-        main()
+    # Usage: day7.py [filename] [--split-engine=scan|bitset|event] [--timeline-engine=scan|array|event]
+    filename = "input_test.txt"
+    split_engine = "scan"
+    timeline_engine = "scan"
+    for arg in sys.argv[1:]:
+        if arg.startswith("--split-engine="):
+            split_engine = arg.split("=", 1)[1]
+        elif arg.startswith("--timeline-engine="):
+            timeline_engine = arg.split("=", 1)[1]
+        else:
+            filename = arg
+    main(filename, split_engine=split_engine, timeline_engine=timeline_engine)
@@ -1,5 +1,12 @@
-import math
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
 import sys
+import tempfile
+from array import array
+from itertools import islice
 from pathlib import Path
 
 # https://adventofcode.com/2025/day/8
@@ -9,90 +16,536 @@ class UnionFind:
     """Helper class to manage connected components (circuits)."""
 
     def __init__(self, n):
-        # Initially, every node is its own parent (its own circuit)
-        self.parent = list(range(n))
+        # Initially, every node is its own parent (its own circuit) of size 1
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+        self.num_components = n
+        # Multiset of component sizes: size -> how many circuits have it, plus the sorted distinct sizes
+        self.size_counts = {1: n} if n else {}
+        self.distinct_sizes = [1] if n else []
 
     def find(self, i):
         """Finds the root representative of the set containing i."""
-        if self.parent[i] != i:
-            # Path compression: point directly to the root
-            self.parent[i] = self.find(self.parent[i])
-        return self.parent[i]
+        parent = self.parent
+        while parent[i] != i:
+            # Path halving: point every other node on the way up to its grandparent
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
     def union(self, i, j):
         """Merges the sets containing i and j. Returns True if merged, False if already same."""
         root_i = self.find(i)
         root_j = self.find(j)
-        if root_i != root_j:
-            self.parent[root_i] = root_j
-            return True
-        return False
+        if root_i == root_j:
+            return False
+
+        # Union by size: hang the smaller tree under the larger one
+        if self.size[root_i] > self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        size_i = self.size[root_i]
+        size_j = self.size[root_j]
+        self.parent[root_i] = root_j
+        self.size[root_j] = size_i + size_j
+        self.num_components -= 1
+
+        self._remove_size(size_i)
+        self._remove_size(size_j)
+        self._add_size(size_i + size_j)
+        return True
+
+    def _add_size(self, size):
+        if size in self.size_counts:
+            self.size_counts[size] += 1
+        else:
+            self.size_counts[size] = 1
+            bisect.insort(self.distinct_sizes, size)
+
+    def _remove_size(self, size):
+        self.size_counts[size] -= 1
+        if not self.size_counts[size]:
+            del self.size_counts[size]
+            del self.distinct_sizes[bisect.bisect_left(self.distinct_sizes, size)]
+
+    def is_connected(self):
+        """True once every node belongs to a single circuit."""
+        return self.num_components <= 1
+
+    def largest_sizes(self, k):
+        """Returns the k largest circuit sizes (descending), read from the size multiset."""
+        sizes = []
+        for size in reversed(self.distinct_sizes):
+            sizes.extend([size] * min(self.size_counts[size], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
 
     def get_component_sizes(self):
         """Returns a list of sizes for all distinct circuits."""
-        counts = {}
-        for i in range(len(self.parent)):
-            root = self.find(i)
-            counts[root] = counts.get(root, 0) + 1
-        return list(counts.values())
+        return self.largest_sizes(self.num_components)
+
+
+def squared_distance(p1, p2):
+    """Squared 3D Euclidean distance; exact integer arithmetic, no sqrt needed for ordering."""
+    return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 + (p1[2] - p2[2]) ** 2
+
+
+class KDTree:
+    """Static 3D KD-tree over the junction boxes, stored as flat per-node lists."""
+
+    LEAF_SIZE = 8
+
+    def __init__(self, points):
+        self.points = points
+        self.order = list(range(len(points)))
+        # Per-node data: slice of self.order, children (-1 for leaves) and bounding box
+        self.node_start = []
+        self.node_end = []
+        self.node_left = []
+        self.node_right = []
+        self.node_min = []
+        self.node_max = []
+        if points:
+            self._build(0, len(points))
+
+    def _build(self, start, end):
+        node = len(self.node_start)
+        members = self.order[start:end]
+        lo = tuple(min(self.points[i][d] for i in members) for d in range(3))
+        hi = tuple(max(self.points[i][d] for i in members) for d in range(3))
+
+        self.node_start.append(start)
+        self.node_end.append(end)
+        self.node_left.append(-1)
+        self.node_right.append(-1)
+        self.node_min.append(lo)
+        self.node_max.append(hi)
+
+        if end - start > self.LEAF_SIZE:
+            # Split on the widest dimension at the median
+            dim = max(range(3), key=lambda d: hi[d] - lo[d])
+            members.sort(key=lambda i: self.points[i][dim])
+            self.order[start:end] = members
+            mid = (start + end) // 2
+            self.node_left[node] = self._build(start, mid)
+            self.node_right[node] = self._build(mid, end)
+
+        return node
+
+    def box_distance(self, node, q):
+        """Squared distance from point q to the bounding box of node (0 if inside)."""
+        lo = self.node_min[node]
+        hi = self.node_max[node]
+        total = 0
+        for d in range(3):
+            if q[d] < lo[d]:
+                total += (lo[d] - q[d]) ** 2
+            elif q[d] > hi[d]:
+                total += (q[d] - hi[d]) ** 2
+        return total
+
+    def k_nearest(self, i, k):
+        """
+        Returns the k nearest neighbours of point i as a list of (dist_sq, j), ascending.
+
+        Ties are broken by index, so the result for k is always a prefix of the result for 2k.
+        """
+        q = self.points[i]
+        best = []  # max-heap of (-dist_sq, -j)
+        stack = [(0, 0)] if self.points else []
+
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+
+            left = self.node_left[node]
+            if left == -1:
+                for j in self.order[self.node_start[node] : self.node_end[node]]:
+                    if j == i:
+                        continue
+                    d = squared_distance(q, self.points[j])
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, -j))
+                    elif (d, j) < (-best[0][0], -best[0][1]):
+                        heapq.heapreplace(best, (-d, -j))
+                continue
+
+            right = self.node_right[node]
+            left_bound = self.box_distance(left, q)
+            right_bound = self.box_distance(right, q)
+            # Push the farther child first so the nearer one is explored first
+            if left_bound <= right_bound:
+                stack.append((right_bound, right))
+                stack.append((left_bound, left))
+            else:
+                stack.append((left_bound, left))
+                stack.append((right_bound, right))
+
+        return sorted((-d, -j) for d, j in best)
+
+    def subtree_labels(self, labels):
+        """Per node, the component label shared by every box in its subtree, or -1 if mixed."""
+        num_nodes = len(self.node_start)
+        node_labels = [-1] * num_nodes
+        # Children are always built after their parent, so a reverse sweep is bottom-up
+        for node in range(num_nodes - 1, -1, -1):
+            left = self.node_left[node]
+            if left == -1:
+                members = self.order[self.node_start[node] : self.node_end[node]]
+                first = labels[members[0]]
+                if all(labels[j] == first for j in members):
+                    node_labels[node] = first
+            elif node_labels[left] == node_labels[self.node_right[node]]:
+                node_labels[node] = node_labels[left]
+        return node_labels
+
+    def nearest_foreign(self, i, labels, node_labels, best=None):
+        """
+        Returns the shortest edge (dist_sq, a, b) with a < b from box i to a box in another component.
+
+        Subtrees lying entirely inside i's component are pruned, as are boxes farther than `best`.
+        Returns `best` unchanged when nothing shorter exists.
+        """
+        q = self.points[i]
+        label = labels[i]
+        stack = [(0, 0)] if self.points else []
+
+        while stack:
+            bound, node = stack.pop()
+            if node_labels[node] == label or (best is not None and bound > best[0]):
+                continue
+
+            left = self.node_left[node]
+            if left == -1:
+                for j in self.order[self.node_start[node] : self.node_end[node]]:
+                    if labels[j] == label:
+                        continue
+                    d = squared_distance(q, self.points[j])
+                    edge = (d, i, j) if i < j else (d, j, i)
+                    if best is None or edge < best:
+                        best = edge
+                continue
+
+            right = self.node_right[node]
+            left_bound = self.box_distance(left, q)
+            right_bound = self.box_distance(right, q)
+            if left_bound <= right_bound:
+                stack.append((right_bound, right))
+                stack.append((left_bound, left))
+            else:
+                stack.append((left_bound, left))
+                stack.append((right_bound, right))
+
+        return best
+
+
+def iter_edges_ascending(junction_boxes, tree=None, initial_k=8):
+    """
+    Lazily yields every pair as (dist_sq, i, j) with i < j, shortest first.
+
+    Each box i keeps a stream of its neighbours j > i, fetched from the KD-tree with a
+    k-nearest query whose k doubles whenever the stream runs dry. A heap merges the heads
+    of all streams, so only the edges actually consumed are ever materialised.
+    """
+    if tree is None:
+        tree = KDTree(junction_boxes)
+    num_boxes = len(junction_boxes)
 
+    # Per-box stream state: fetched neighbours, read position and current k
+    buffers = [[] for _ in range(num_boxes)]
+    positions = [0] * num_boxes
+    fetch_sizes = [initial_k] * num_boxes
+
+    def refill(i, after):
+        """Fetches more neighbours of i that sort after the key `after`; False when exhausted."""
+        while True:
+            k = fetch_sizes[i]
+            neighbours = tree.k_nearest(i, k)
+            fetch_sizes[i] = k * 2
+            buffers[i] = [(d, j) for d, j in neighbours if j > i and (after is None or (d, j) > after)]
+            positions[i] = 0
+            if buffers[i]:
+                return True
+            if len(neighbours) < k:
+                return False
+
+    heap = []
+    for i in range(num_boxes):
+        if refill(i, None):
+            d, j = buffers[i][0]
+            heap.append((d, i, j))
+    heapq.heapify(heap)
+
+    while heap:
+        d, i, j = heap[0]
+        yield d, i, j
+
+        positions[i] += 1
+        if positions[i] < len(buffers[i]) or refill(i, (d, j)):
+            nd, nj = buffers[i][positions[i]]
+            heapq.heapreplace(heap, (nd, i, nj))
+        else:
+            heapq.heappop(heap)
+
+
+def shortest_edges(junction_boxes, k):
+    """Returns the k shortest edges as (dist_sq, i, j), using the lazy heap merge rather than a full sort."""
+    return list(islice(iter_edges_ascending(junction_boxes), k))
+
+
+def euclidean_mst(junction_boxes, tree=None):
+    """
+    Builds the Euclidean minimum spanning tree with Boruvka rounds over the KD-tree.
+
+    Each round, every component finds its shortest edge to another component with
+    nearest-foreign-neighbour queries, then all those edges are merged; the number of
+    components at least halves per round. Edges are ordered by (dist_sq, i, j), the same
+    total order a Kruskal sweep over sorted pairs uses, so the tree is identical.
+
+    Returns:
+        The MST edges as (dist_sq, i, j), in the order Kruskal would add them.
+    """
+    if tree is None:
+        tree = KDTree(junction_boxes)
+    num_boxes = len(junction_boxes)
+    uf = UnionFind(num_boxes)
+    mst_edges = []
+
+    while not uf.is_connected():
+        labels = [uf.find(i) for i in range(num_boxes)]
+        node_labels = tree.subtree_labels(labels)
+
+        component_best = {}
+        for i in tree.order:
+            label = labels[i]
+            best = tree.nearest_foreign(i, labels, node_labels, component_best.get(label))
+            if best is not None:
+                component_best[label] = best
+
+        for edge in set(component_best.values()):
+            if uf.union(edge[1], edge[2]):
+                mst_edges.append(edge)
+
+    mst_edges.sort()
+    return mst_edges
+
+
+def write_sorted_edge_pairs(junction_boxes, path, block_keys=1 << 18):
+    """
+    Writes every pair to path as interleaved array('i') indices [i0, j0, i1, j1, ...] in
+    ascending (dist_sq, i, j) order.
+
+    Each pair is packed into a single exact int64 key (dist_sq, then i, then j in fixed-width
+    bit fields), so one int sort replaces sorting float tuples. Keys are generated and sorted
+    in blocks of about block_keys, each block is spilled to a temporary run file, and the runs
+    are merged with a heap, so peak memory follows the block size instead of n^2 / 2 pairs.
+    """
+    path = Path(path)
+    num_boxes = len(junction_boxes)
+    bits = max(num_boxes.bit_length(), 1)
+    mask = (1 << bits) - 1
+    max_dist_sq = sum((max(axis) - min(axis)) ** 2 for axis in zip(*junction_boxes)) if junction_boxes else 0
+    if max_dist_sq << (2 * bits) >= 1 << 63:
+        raise ValueError("coordinates too large to pack pair keys into 64 bits")
+
+    def read_run(run_path, chunk_keys=1 << 16):
+        with open(run_path, "rb") as run_file:
+            while True:
+                chunk = array("q")
+                try:
+                    chunk.fromfile(run_file, chunk_keys)
+                except EOFError:
+                    # fromfile keeps the items it could read before raising
+                    yield from chunk
+                    return
+                yield from chunk
+
+    with tempfile.TemporaryDirectory(dir=path.parent) as run_dir:
+        runs = []
+        keys = []
+
+        def spill():
+            keys.sort()
+            run_path = Path(run_dir) / f"run{len(runs)}.bin"
+            with open(run_path, "wb") as run_file:
+                array("q", keys).tofile(run_file)
+            runs.append(run_path)
+            keys.clear()
+
+        for i in range(num_boxes - 1):
+            xi, yi, zi = junction_boxes[i]
+            prefix = i << bits
+            keys.extend(
+                ((((xi - x) ** 2 + (yi - y) ** 2 + (zi - z) ** 2) << (2 * bits)) | prefix | j)
+                for j, (x, y, z) in enumerate(junction_boxes[i + 1 :], i + 1)
+            )
+            if len(keys) >= block_keys:
+                spill()
+        if keys:
+            spill()
+
+        merged = heapq.merge(*(read_run(run_path) for run_path in runs))
+        with open(path, "wb") as file:
+            while True:
+                chunk = array("q", islice(merged, 1 << 16))
+                if not chunk:
+                    break
+                pairs = array("i", bytes(8 * len(chunk)))
+                pairs[0::2] = array("i", ((key >> bits) & mask for key in chunk))
+                pairs[1::2] = array("i", (key & mask for key in chunk))
+                pairs.tofile(file)
+
+
+def edge_cache_path(junction_boxes, cache_dir=None):
+    """Cache file for the sorted edge order, keyed by a hash of the parsed input."""
+    if cache_dir is None:
+        cache_dir = Path(__file__).resolve().parent / ".edge_cache"
+    digest = hashlib.sha256(repr(junction_boxes).encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"edges_{digest}.bin"
+
+
+def iter_cached_edges(junction_boxes, cache_dir=None):
+    """
+    Yields every pair as (dist_sq, i, j) in ascending order from an on-disk edge cache.
+
+    The first run generates and sorts the pairs and writes them to disk; later runs on the
+    same input memory-map the file and skip generation and sorting entirely.
+
+    Only what_if (--edge-cache) reads it: a threshold sweep walks an unbounded prefix of
+    the full edge order, which is what the file stores. main and part2 stay on the k-d tree
+    streams (shortest_edges / euclidean_mst), which only ever touch a small part of it.
+    """
+    path = edge_cache_path(junction_boxes, cache_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_sorted_edge_pairs(junction_boxes, path.with_suffix(".tmp"))
+        os.replace(path.with_suffix(".tmp"), path)
+
+    if path.stat().st_size == 0:
+        return
 
-def main(filename: str = "input_test.txt", connections_to_make=10):
-    print(f"Processing file: {filename}")
-    base_dir = Path(__file__).resolve().parent
-    file_path = base_dir / filename
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pairs = memoryview(mm).cast("i")
+        try:
+            for k in range(0, len(pairs), 2):
+                i = pairs[k]
+                j = pairs[k + 1]
+                yield squared_distance(junction_boxes[i], junction_boxes[j]), i, j
+        finally:
+            pairs.release()
 
-    # 1. Parse Input
-    junction_boxes = []
-    with open(file_path, "r") as file:
-        lines = file.readlines()
 
+def parse_junction_boxes(lines):
+    """Converts lines like "162,817,812" into a list of (x, y, z) tuples."""
+    junction_boxes = []
     for line in lines:
         line = line.strip()
         if not line:
             continue
-        # Convert "162,817,812" -> (162, 817, 812)
-        coords = tuple(map(int, line.split(",")))
-        junction_boxes.append(coords)
+        junction_boxes.append(tuple(map(int, line.split(","))))
+    return junction_boxes
 
-    # 2. Generate all possible edges (pairs of boxes)
-    edges = []
+
+def sweep_connections(junction_boxes, thresholds, edges=None):
+    """
+    Processes edges once in distance order and answers several connection counts at once.
+
+    Args:
+        junction_boxes: List of (x, y, z) coordinates.
+        thresholds: Connection counts to snapshot (e.g. [10, 100, 1000]).
+        edges: Optional ascending edge iterable; defaults to the lazy KD-tree stream.
+
+    Returns:
+        (snapshots, final_pair): snapshots maps each threshold to
+        (largest three circuit sizes, number of circuits) after that many connections;
+        final_pair is the (i, j) whose merge joined everything, or None.
+    """
     num_boxes = len(junction_boxes)
+    pending = sorted(set(thresholds))
+    snapshots = {}
+    final_pair = None
+    uf = UnionFind(num_boxes)
 
-    for i in range(num_boxes):
-        for j in range(i + 1, num_boxes):
-            p1 = junction_boxes[i]
-            p2 = junction_boxes[j]
+    def record(made):
+        while pending and pending[0] <= made:
+            snapshots[pending.pop(0)] = (uf.largest_sizes(3), uf.num_components)
+
+    if edges is None:
+        edges = iter_edges_ascending(junction_boxes)
+
+    made = 0
+    record(made)
+    for _, u, v in edges:
+        if uf.union(u, v) and uf.is_connected():
+            final_pair = (u, v)
+        made += 1
+        record(made)
+        if not pending and uf.is_connected():
+            break
+
+    # Thresholds beyond the number of pairs see the final state
+    for threshold in pending:
+        snapshots[threshold] = (uf.largest_sizes(3), uf.num_components)
 
-            # Calculate 3D Euclidean distance
-            dist = math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 + (p1[2] - p2[2]) ** 2)
-            # Store as (distance, index_1, index_2)
-            edges.append((dist, i, j))
+    return snapshots, final_pair
+
+
+def what_if(filename: str = "input_test.txt", thresholds=(10,), use_edge_cache=False):
+    """Reports circuit stats for many connection counts from a single edge sweep."""
+    print(f"Processing file: {filename}")
+    base_dir = Path(__file__).resolve().parent
+    file_path = base_dir / filename
+
+    with open(file_path, "r") as file:
+        junction_boxes = parse_junction_boxes(file.readlines())
 
-    # 3. Sort edges by distance (shortest first)
-    edges.sort(key=lambda x: x[0])
+    edges = iter_cached_edges(junction_boxes) if use_edge_cache else None
+    snapshots, final_pair = sweep_connections(junction_boxes, thresholds, edges)
+    for threshold in sorted(snapshots):
+        sizes, num_components = snapshots[threshold]
+        print(f"After {threshold} connections: {num_components} circuits, largest sizes {sizes}")
 
-    # 4. Process the "10 shortest connections"
+    if final_pair:
+        idx1, idx2 = final_pair
+        print(
+            f"Final merge joined indices {idx1} (X={junction_boxes[idx1][0]}) and {idx2} (X={junction_boxes[idx2][0]})."
+        )
+
+    return snapshots, final_pair
+
+
+def main(filename: str = "input_test.txt", connections_to_make=10):
+    print(f"Processing file: {filename}")
+    base_dir = Path(__file__).resolve().parent
+    file_path = base_dir / filename
+
+    # 1. Parse Input
+    with open(file_path, "r") as file:
+        junction_boxes = parse_junction_boxes(file.readlines())
+
+    # 2. Take the shortest edges straight from the spatial index (no full pair list or sort)
+    num_boxes = len(junction_boxes)
+    edges = shortest_edges(junction_boxes, connections_to_make)
+
+    # 3. Process the "10 shortest connections"
     uf = UnionFind(num_boxes)
 
     # Ensure we don't crash if input is tiny (fewer than 10 edges)
-    limit = min(len(edges), connections_to_make)
+    limit = len(edges)
 
     print(f"Attempting the first {limit} connections...")
 
     for k in range(limit):
-        dist, u, v = edges[k]
+        dist_sq, u, v = edges[k]
         was_merged = uf.union(u, v)
         _status = "merged" if was_merged else "already connected"
         # Optional: Print detail similar to the prompt example
-        # print(f"Connection {k+1}: Box {u} <-> Box {v} (dist {dist:.2f}) -> {status}")
-
-    # 5. Calculate Result
-    # Get all circuit sizes
-    sizes = uf.get_component_sizes()
+        # print(f"Connection {k+1}: Box {u} <-> Box {v} (dist_sq {dist_sq}) -> {status}")
 
-    # Sort sizes descending to find the largest ones
-    sizes.sort(reverse=True)
+    # 4. Calculate Result
+    # The three largest circuit sizes come straight from the union-find size multiset
+    sizes = uf.largest_sizes(3)
 
     # Multiply the 3 largest sizes
     # (Safety check: assumes at least 3 circuits exist, which is true for the puzzle input)
@@ -115,7 +568,6 @@ def part2(filename: str = "input_test.txt"):
     file_path = base_dir / filename
 
     # 1. Parse Input
-    junction_boxes = []
     try:
         with open(file_path, "r") as file:
             lines = file.readlines()
@@ -123,60 +575,20 @@ def part2(filename: str = "input_test.txt"):
         print(f"Error: File '{filename}' not found.")
         return
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        coords = tuple(map(int, line.split(",")))
-        junction_boxes.append(coords)
+    junction_boxes = parse_junction_boxes(lines)
 
     num_boxes = len(junction_boxes)
     print(f"Found {num_boxes} junction boxes.")
 
-    # 2. Generate and Sort Edges
-    # ... (Edge generation and sorting logic remains the same) ...
-    edges = []
-    for i in range(num_boxes):
-        for j in range(i + 1, num_boxes):
-            p1 = junction_boxes[i]
-            p2 = junction_boxes[j]
-            # Use squared distance for sorting speed if needed, but for simplicity/clarity,
-            # we'll keep the full distance calculation as before.
-            dist = math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 + (p1[2] - p2[2]) ** 2)
-            # Store distance and original indices
-            edges.append((dist, i, j))
-
-    print("Sorting all pairs by distance...")
-    edges.sort(key=lambda x: x[0])
+    # 2. The last merge that joins everything is the heaviest edge of the minimum spanning tree
+    mst_edges = euclidean_mst(junction_boxes)
+    print(f"Built minimum spanning tree with {len(mst_edges)} connections.")
 
     # 3. Find the Last Connection
-    uf = UnionFind(num_boxes)
-    successful_merges = 0
     final_pair_indices = None
-
-    # We need N - 1 successful merges to connect N nodes into one circuit.
-    target_merges = num_boxes - 1
-
-    print(f"Targeting {target_merges} successful merges...")
-
-    for k in range(len(edges)):
-        dist, u_idx, v_idx = edges[k]
-
-        # Attempt to merge the two boxes
-        was_merged = uf.union(u_idx, v_idx)
-
-        if was_merged:
-            successful_merges += 1
-
-            # If this was the final successful merge, record the pair and break
-            if successful_merges == target_merges:
-                final_pair_indices = (u_idx, v_idx)
-                # print(f"Connection {successful_merges}: Final merge found at edge index {k}")
-                break
-
-        # Safety break if we run out of edges
-        if k == len(edges) - 1 and successful_merges < target_merges:
-            print("Error: Ran out of edges before connecting all boxes.")
+    if num_boxes > 1:
+        _, u_idx, v_idx = mst_edges[-1]
+        final_pair_indices = (u_idx, v_idx)
 
     # 4. Calculate the Final Result
     if final_pair_indices:
@@ -196,7 +608,13 @@ def part2(filename: str = "input_test.txt"):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    # Usage: day8.py [filename] [--thresholds=10,100,1000 [--edge-cache]]
+    thresholds_args = [a for a in sys.argv[1:] if a.startswith("--thresholds=")]
+    if thresholds_args:
+        filenames = [a for a in sys.argv[1:] if not a.startswith("--")]
+        thresholds = [int(x) for x in thresholds_args[0].split("=", 1)[1].split(",")]
+        what_if(*filenames[:1], thresholds=thresholds, use_edge_cache="--edge-cache" in sys.argv)
+    elif len(sys.argv) > 1:
         main(sys.argv[1], connections_to_make=1000)
         part2(sys.argv[1])
     else:
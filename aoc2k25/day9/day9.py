@@ -1,4 +1,11 @@
+import os
 import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from operator import add
 from pathlib import Path
 
 
@@ -57,6 +64,252 @@ def edge_intersects_rect_interior(edge, rect):
     return False
 
 
+class IntervalTree:
+    """
+    Centered interval tree over closed intervals (lo, hi, payload).
+
+    Each node keeps the intervals containing its center twice, sorted by lo ascending and by
+    hi descending, so stabbing and overlap queries cost O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        self.center = None
+        self.by_lo = []
+        self.by_hi = []
+        self.left = None
+        self.right = None
+        if not intervals:
+            return
+
+        endpoints = sorted(e for lo, hi, _ in intervals for e in (lo, hi))
+        self.center = endpoints[len(endpoints) // 2]
+        here = [iv for iv in intervals if iv[0] <= self.center <= iv[1]]
+        self.by_lo = sorted(here, key=lambda iv: iv[0])
+        self.by_hi = sorted(here, key=lambda iv: iv[1], reverse=True)
+
+        left = [iv for iv in intervals if iv[1] < self.center]
+        right = [iv for iv in intervals if iv[0] > self.center]
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def stab(self, point):
+        """Yields the payload of every interval with lo <= point < hi."""
+        node = self
+        while node is not None and node.center is not None:
+            if point < node.center:
+                for lo, _, payload in node.by_lo:
+                    if lo > point:
+                        break
+                    yield payload
+                node = node.left
+            else:
+                for _, hi, payload in node.by_hi:
+                    if hi <= point:
+                        break
+                    yield payload
+                node = node.right if point > node.center else None
+
+    def overlapping(self, lo, hi):
+        """Yields the payload of every interval sharing more than a single point with (lo, hi)."""
+        if lo >= hi:
+            return
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.center is None:
+                continue
+            if hi <= node.center:
+                for iv_lo, _, payload in node.by_lo:
+                    if iv_lo >= hi:
+                        break
+                    yield payload
+                stack.append(node.left)
+            elif lo >= node.center:
+                for _, iv_hi, payload in node.by_hi:
+                    if iv_hi <= lo:
+                        break
+                    yield payload
+                stack.append(node.right)
+            else:
+                for _, _, payload in node.by_lo:
+                    yield payload
+                stack.append(node.left)
+                stack.append(node.right)
+
+
+class StabCounter:
+    """
+    Segment tree over the slabs between interval endpoints, for counting stabbed intervals.
+
+    Each half-open interval [lo, hi) with a key is stored at the O(log n) tree nodes that
+    exactly cover its slabs, and every node keeps its keys sorted. The intervals containing
+    a point are exactly those stored on the point's leaf-to-root path, so counting the ones
+    with key > k is a bisect per node: O(log^2 n), independent of how many are stabbed.
+    """
+
+    def __init__(self, intervals):
+        self.bounds = sorted({e for lo, hi, _ in intervals for e in (lo, hi)})
+        self.size = 1
+        while self.size < max(len(self.bounds) - 1, 1):
+            self.size *= 2
+        self.keys = [[] for _ in range(2 * self.size)]
+        for lo, hi, key in intervals:
+            left = bisect_left(self.bounds, lo) + self.size
+            right = bisect_left(self.bounds, hi) + self.size
+            while left < right:
+                if left & 1:
+                    self.keys[left].append(key)
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    self.keys[right].append(key)
+                left >>= 1
+                right >>= 1
+        for node_keys in self.keys:
+            node_keys.sort()
+
+    def count_greater(self, point, key):
+        """Number of intervals with lo <= point < hi whose key is greater than key."""
+        slab = bisect_right(self.bounds, point) - 1
+        if slab < 0 or slab >= len(self.bounds) - 1:
+            return 0
+        node = slab + self.size
+        total = 0
+        while node:
+            node_keys = self.keys[node]
+            total += len(node_keys) - bisect_right(node_keys, key)
+            node >>= 1
+        return total
+
+
+class PolygonEdgeIndex:
+    """
+    Query index over the edges of a rectilinear polygon.
+
+    Vertical edges go in an interval tree on their y-spans (payload: their x) and horizontal
+    edges in one on their x-spans (payload: their y); vertical edges also go in a
+    StabCounter keyed by x. Ray-cast crossing counts become bisect lookups along one
+    root-to-leaf path and "does an edge cut this rectangle" becomes a range-stabbing query,
+    instead of linear scans over every edge.
+    """
+
+    def __init__(self, vertices):
+        vertical = []
+        horizontal = []
+        for (x1, y1), (x2, y2) in build_poly_edges(vertices):
+            if x1 == x2 and y1 != y2:
+                vertical.append((min(y1, y2), max(y1, y2), x1))
+            elif y1 == y2 and x1 != x2:
+                horizontal.append((min(x1, x2), max(x1, x2), y1))
+        self.vertical = IntervalTree(vertical)
+        self.horizontal = IntervalTree(horizontal)
+        self.vertical_crossings = StabCounter(vertical)
+
+    def crossings_right(self, x, y):
+        """Number of vertical edges a ray going right from (x, y) crosses, in O(log^2 n)."""
+        return self.vertical_crossings.count_greater(y, x)
+
+    def contains_point(self, x, y):
+        """Ray casting, like is_point_in_polygon: odd crossings = inside."""
+        return self.crossings_right(x, y) % 2 == 1
+
+    def cuts_rect_interior(self, rect):
+        """True when some edge passes through the rectangle interior, like edge_intersects_rect_interior."""
+        rx_min, rx_max, ry_min, ry_max = rect
+        if any(rx_min < x < rx_max for x in self.vertical.overlapping(ry_min, ry_max)):
+            return True
+        return any(ry_min < y < ry_max for y in self.horizontal.overlapping(rx_min, rx_max))
+
+    def rectangle_is_valid(self, rect):
+        """Same checks as rectangle_is_valid, answered from the index."""
+        rx_min, rx_max, ry_min, ry_max = rect
+        if not self.contains_point((rx_min + rx_max) / 2.0, (ry_min + ry_max) / 2.0):
+            # Special case for thin rectangles on the boundary
+            if rx_max > rx_min and ry_max > ry_min:
+                return False
+        return not self.cuts_rect_interior(rect)
+
+
+class CompressedPolygonGrid:
+    """
+    Rasterised polygon on a coordinate-compressed grid with a 2D prefix sum of outside cells.
+
+    Compressed column 2k is the tile column xs[k]; column 2k+1 stands for every tile strictly
+    between xs[k] and xs[k+1] (rows likewise). A cell is inside when its tiles are red/green,
+    i.e. on the polygon boundary or enclosed by it. Gap columns and rows that hold no tiles
+    (adjacent coordinates) get weight 0, so the count is tile-exact: after preprocessing,
+    asking whether a rectangle is entirely red/green is an O(1) prefix-sum query.
+
+    Prefix rows are array('i'), 4 bytes per entry. The table still has (2n - 1)^2 entries,
+    because an exact query needs prefix values on both sides of every gap.
+    """
+
+    def __init__(self, red_tiles):
+        self.xs = sorted({x for x, _ in red_tiles})
+        self.ys = sorted({y for _, y in red_tiles})
+        width = 2 * len(self.xs) - 1
+        height = 2 * len(self.ys) - 1
+
+        # Boundary cells per compressed row, as int bitmasks
+        boundary = [0] * height
+        # Compressed column and row span of each vertical edge
+        vertical_edges = []
+        n = len(red_tiles)
+        for i in range(n):
+            (x1, y1), (x2, y2) = red_tiles[i], red_tiles[(i + 1) % n]
+            c1, c2 = sorted((self.column(x1), self.column(x2)))
+            r1, r2 = sorted((self.row(y1), self.row(y2)))
+            span = (1 << (c2 + 1)) - (1 << c1)
+            for r in range(r1, r2 + 1):
+                boundary[r] |= span
+            if c1 == c2 and r1 != r2:
+                vertical_edges.append((c1, r1, r2))
+
+        # Fill the interior. Gap rows use ray-casting parity over the vertical edges crossing
+        # them; a tile row only gains interior cells directly below an inside gap cell.
+        inside = [0] * height
+        for r in range(height):
+            if r % 2 == 1:
+                crossings = sorted(c for c, r1, r2 in vertical_edges if r1 < r < r2)
+                fill = 0
+                for a, b in zip(crossings[0::2], crossings[1::2]):
+                    fill |= (1 << (b + 1)) - (1 << a)
+                inside[r] = boundary[r] | fill
+            else:
+                inside[r] = boundary[r] | (inside[r - 1] if r > 0 else 0)
+
+        # Columns and rows that contain tiles: every tile line, and gaps wider than zero
+        tile_columns = 0
+        for c in range(width):
+            if c % 2 == 0 or self.xs[c // 2 + 1] - self.xs[c // 2] > 1:
+                tile_columns |= 1 << c
+        tile_rows = [r % 2 == 0 or self.ys[r // 2 + 1] - self.ys[r // 2] > 1 for r in range(height)]
+
+        # prefix[r][c] = number of outside cells in rows < r and columns < c
+        to_cells = str.maketrans("01", "\x00\x01")
+        self.prefix = [array("i", bytes(4 * (width + 1)))]
+        for r in range(height):
+            outside = tile_columns & ~inside[r] if tile_rows[r] else 0
+            cells = format(outside, f"0{width}b")[::-1].translate(to_cells).encode()
+            row_counts = accumulate(cells, initial=0)
+            self.prefix.append(array("i", map(add, self.prefix[-1], row_counts)))
+
+    def column(self, x):
+        return 2 * bisect_left(self.xs, x)
+
+    def row(self, y):
+        return 2 * bisect_left(self.ys, y)
+
+    def rect_is_inside(self, x1, y1, x2, y2):
+        """True when every tile of the rectangle spanned by two red tiles is red or green."""
+        c1, c2 = sorted((self.column(x1), self.column(x2)))
+        r1, r2 = sorted((self.row(y1), self.row(y2)))
+        p = self.prefix
+        return p[r2 + 1][c2 + 1] - p[r1][c2 + 1] - p[r2 + 1][c1] + p[r1][c1] == 0
+
+
 def solve_part1(red_tiles):
     """Find largest rectangle with red tiles at opposite corners."""
     max_area = 0
@@ -77,16 +330,78 @@ def solve_part1(red_tiles):
     return max_area
 
 
-def solve_part2(red_tiles):
-    """Find largest rectangle using only red and green tiles."""
+def staircase(points, x_sign, y_sign):
+    """
+    Pareto frontier of the points towards one corner of the plane.
+
+    With x_sign = y_sign = 1 this keeps the points no other point beats on both smaller x and
+    smaller y (the lower-left staircase); -1 flips the corresponding axis.
+    """
+    frontier = []
+    best_y = None
+    for x, y in sorted(points, key=lambda p: (x_sign * p[0], y_sign * p[1])):
+        if best_y is None or y_sign * y < best_y:
+            best_y = y_sign * y
+            frontier.append((x, y))
+    return frontier
 
-    # Build polygon edges (connecting consecutive red tiles)
-    poly_edges = []
+
+def solve_part1_frontier(red_tiles):
+    """
+    Find largest rectangle with red tiles at opposite corners, searching only extreme points.
+
+    Replacing a corner by a tile that lies further out on both axes never shrinks the
+    rectangle, so an optimal pair always joins the lower-left and upper-right staircases,
+    or the upper-left and lower-right ones. Only those frontier points are paired up.
+    """
+    lower_left = staircase(red_tiles, 1, 1)
+    upper_right = staircase(red_tiles, -1, -1)
+    upper_left = staircase(red_tiles, 1, -1)
+    lower_right = staircase(red_tiles, -1, 1)
+
+    max_area = 0
+    for corners, opposite in ((lower_left, upper_right), (upper_left, lower_right)):
+        for x1, y1 in corners:
+            for x2, y2 in opposite:
+                # They must be diagonal (different x AND different y)
+                if x1 != x2 and y1 != y2:
+                    max_area = max(max_area, (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1))
+
+    return max_area
+
+
+def build_poly_edges(red_tiles):
+    """Build polygon edges (connecting consecutive red tiles, wrapping around)."""
     n = len(red_tiles)
-    for i in range(n):
-        p1 = red_tiles[i]
-        p2 = red_tiles[(i + 1) % n]  # Wrap around
-        poly_edges.append((p1, p2))
+    return [(red_tiles[i], red_tiles[(i + 1) % n]) for i in range(n)]
+
+
+def rectangle_is_valid(rect, poly_edges):
+    """Checks that the rectangle (rx_min, rx_max, ry_min, ry_max) only covers red and green tiles."""
+    rx_min, rx_max, ry_min, ry_max = rect
+    width = rx_max - rx_min + 1
+    height = ry_max - ry_min + 1
+
+    # Validity Check 1: Is the center of the rectangle inside the polygon?
+    mid_x = (rx_min + rx_max) / 2.0
+    mid_y = (ry_min + ry_max) / 2.0
+
+    if not is_point_in_polygon(mid_x, mid_y, poly_edges):
+        # Special case for thin rectangles on the boundary
+        if width > 1 and height > 1:
+            return False
+
+    # Validity Check 2: Does any polygon edge cut through the rectangle interior?
+    for edge in poly_edges:
+        if edge_intersects_rect_interior(edge, rect):
+            return False
+
+    return True
+
+
+def solve_part2(red_tiles):
+    """Find largest rectangle using only red and green tiles."""
+    poly_edges = build_poly_edges(red_tiles)
 
     max_area = 0
 
@@ -104,38 +419,159 @@ def solve_part2(red_tiles):
             rx_min, rx_max = min(x1, x2), max(x1, x2)
             ry_min, ry_max = min(y1, y2), max(y1, y2)
 
-            width = rx_max - rx_min + 1
-            height = ry_max - ry_min + 1
-            area = width * height
+            area = (rx_max - rx_min + 1) * (ry_max - ry_min + 1)
 
             # Optimization: skip if area won't improve our max
             if area <= max_area:
                 continue
 
-            # Validity Check 1: Is the center of the rectangle inside the polygon?
-            mid_x = (rx_min + rx_max) / 2.0
-            mid_y = (ry_min + ry_max) / 2.0
+            if rectangle_is_valid((rx_min, rx_max, ry_min, ry_max), poly_edges):
+                max_area = area
 
-            if not is_point_in_polygon(mid_x, mid_y, poly_edges):
-                # Special case for thin rectangles on the boundary
-                if width > 1 and height > 1:
-                    continue
+    return max_area
 
-            # Validity Check 2: Does any polygon edge cut through the rectangle interior?
-            rect = (rx_min, rx_max, ry_min, ry_max)
-            intersection_found = False
-            for edge in poly_edges:
-                if edge_intersects_rect_interior(edge, rect):
-                    intersection_found = True
-                    break
 
-            if not intersection_found:
+def candidate_rectangles_by_area(red_tiles):
+    """All diagonal red-tile pairs as (area, rect), largest area first."""
+    candidates = []
+    for i in range(len(red_tiles)):
+        x1, y1 = red_tiles[i]
+        for j in range(i + 1, len(red_tiles)):
+            x2, y2 = red_tiles[j]
+            if x1 == x2 or y1 == y2:
+                continue
+            rect = (min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2))
+            candidates.append(((abs(x2 - x1) + 1) * (abs(y2 - y1) + 1), rect))
+    candidates.sort(reverse=True)
+    return candidates
+
+
+# Polygon edges for pool workers, set once per process by the initializer
+_worker_poly_edges = None
+
+
+def _init_worker(poly_edges):
+    global _worker_poly_edges
+    _worker_poly_edges = poly_edges
+
+
+def _first_valid_in_batch(batch):
+    """Returns the position of the first valid rectangle in the batch, or -1."""
+    for k, (_, rect) in enumerate(batch):
+        if rectangle_is_valid(rect, _worker_poly_edges):
+            return k
+    return -1
+
+
+def solve_part2_area_order(red_tiles, workers=None, batch_size=256):
+    """
+    Find largest rectangle using only red and green tiles, checking candidates largest first.
+
+    Candidates are sorted by area once, so the first valid one is the answer. Batches of
+    candidates are checked across a process pool (in area order); the earliest batch holding
+    a valid rectangle ends the search and outstanding batches are cancelled.
+
+    Args:
+        red_tiles: Polygon vertices in order.
+        workers: Pool size; None uses os.cpu_count(), 1 checks batches in-process.
+        batch_size: Number of candidates per batch.
+    """
+    poly_edges = build_poly_edges(red_tiles)
+    candidates = candidate_rectangles_by_area(red_tiles)
+    batches = [candidates[k : k + batch_size] for k in range(0, len(candidates), batch_size)]
+
+    if workers == 1:
+        _init_worker(poly_edges)
+        for batch in batches:
+            k = _first_valid_in_batch(batch)
+            if k != -1:
+                return batch[k][0]
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(poly_edges,)) as pool:
+        # Keep a bounded window of batches in flight and consume results in area order
+        window = 2 * workers
+        in_flight = deque()
+        next_batch = 0
+        while next_batch < len(batches) or in_flight:
+            while next_batch < len(batches) and len(in_flight) < window:
+                batch = batches[next_batch]
+                in_flight.append((batch, pool.submit(_first_valid_in_batch, batch)))
+                next_batch += 1
+
+            batch, future = in_flight.popleft()
+            k = future.result()
+            if k != -1:
+                for _, pending in in_flight:
+                    pending.cancel()
+                return batch[k][0]
+
+    return 0
+
+
+def solve_part2_indexed(red_tiles):
+    """Find largest rectangle using only red and green tiles, with validity checks from a PolygonEdgeIndex."""
+    index = PolygonEdgeIndex(red_tiles)
+    max_area = 0
+
+    for i in range(len(red_tiles)):
+        x1, y1 = red_tiles[i]
+        for j in range(i + 1, len(red_tiles)):
+            x2, y2 = red_tiles[j]
+
+            # They must be diagonal
+            if x1 == x2 or y1 == y2:
+                continue
+
+            area = (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
+            if area <= max_area:
+                continue
+
+            if index.rectangle_is_valid((min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2))):
+                max_area = area
+
+    return max_area
+
+
+def solve_part2_prefix(red_tiles):
+    """Find largest rectangle using only red and green tiles, with O(1) prefix-sum validity checks."""
+    if not red_tiles:
+        return 0
+
+    grid = CompressedPolygonGrid(red_tiles)
+    max_area = 0
+
+    for i in range(len(red_tiles)):
+        x1, y1 = red_tiles[i]
+        for j in range(i + 1, len(red_tiles)):
+            x2, y2 = red_tiles[j]
+
+            # They must be diagonal
+            if x1 == x2 or y1 == y2:
+                continue
+
+            area = (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
+            if area > max_area and grid.rect_is_inside(x1, y1, x2, y2):
                 max_area = area
 
     return max_area
 
 
-def main(filename: str = "input_test.txt"):
+PART1_ENGINES = {
+    "scan": solve_part1,
+    "frontier": solve_part1_frontier,
+}
+
+PART2_ENGINES = {
+    "scan": solve_part2,
+    "prefix": solve_part2_prefix,
+    "area": solve_part2_area_order,
+    "indexed": solve_part2_indexed,
+}
+
+
+def main(filename: str = "input_test.txt", part1_engine: str = "scan", part2_engine: str = "scan"):
     print(f"Processing file: {filename}")
     base_dir = Path(__file__).resolve().parent
     file_path = base_dir / filename
@@ -163,16 +599,24 @@ def main(filename: str = "input_test.txt"):
     print("-" * 30)
 
     # Run Part 1
-    result_p1 = solve_part1(red_tiles)
+    result_p1 = PART1_ENGINES[part1_engine](red_tiles)
     print(f"Part 1 Result: {result_p1}")
 
     # Run Part 2
-    result_p2 = solve_part2(red_tiles)
+    result_p2 = PART2_ENGINES[part2_engine](red_tiles)
     print(f"Part 2 Result: {result_p2}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        main(sys.argv[1])
-    else:
-        main()
+    # Usage: day9.py [filename] [--part1-engine=scan|frontier] [--part2-engine=scan|prefix|area|indexed]
+    filename = "input_test.txt"
+    part1_engine = "scan"
+    part2_engine = "scan"
+    for arg in sys.argv[1:]:
+        if arg.startswith("--part1-engine="):
+            part1_engine = arg.split("=", 1)[1]
+        elif arg.startswith("--part2-engine="):
+            part2_engine = arg.split("=", 1)[1]
+        else:
+            filename = arg
+    main(filename, part1_engine=part1_engine, part2_engine=part2_engine)